@@ -0,0 +1,207 @@
+import json
+import mmap
+import os
+import struct
+import threading
+
+import pygame
+
+ASSET_PACK_PATH = "assets.pack"
+PACK_MAGIC = b"CDAP"
+PACK_VERSION = 1
+# Magic, format version, length of the JSON index that follows
+PACK_PREAMBLE = struct.Struct("<4sBI")
+PACK_ALIGNMENT = 64
+
+
+def pack_key(path, alpha=False, scale=None, size=None, flip_x=False):
+    return json.dumps([path, alpha, scale, list(size) if size is not None else None, flip_x])
+
+
+class AssetPack:
+    # A file of ready-to-blit pixels and mixer-format PCM, mapped copy-on-write. Images
+    # are Surfaces over the mapping itself, so the map stays open for the whole run;
+    # a Surface that is drawn on gets private copies of its pages, never the file's.
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            self.map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_length = PACK_PREAMBLE.unpack_from(self.map)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} asset pack")
+        start = PACK_PREAMBLE.size
+        index = json.loads(self.map[start:start + index_length].decode("utf-8"))
+        self.view = memoryview(self.map)
+        self.image_entries = index["images"]
+        self.sound_entries = index["sounds"]
+        self.mixer_format = tuple(index["mixer"]) if index["mixer"] else None
+
+    @classmethod
+    def open(cls, path=ASSET_PACK_PATH):
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def has_image(self, key):
+        return key in self.image_entries
+
+    def image(self, key):
+        entry = self.image_entries.get(key)
+        if entry is None:
+            return None
+        offset, length, width, height, pixel_format = entry
+        return pygame.image.frombuffer(self.view[offset:offset + length], (width, height), pixel_format)
+
+    def sound(self, path):
+        entry = self.sound_entries.get(path)
+        # PCM is only usable when the mixer runs at the rate and layout it was packed for
+        if entry is None or pygame.mixer.get_init() != self.mixer_format:
+            return None
+        offset, length = entry
+        return pygame.mixer.Sound(buffer=self.view[offset:offset + length])
+
+
+def write_pack(path, images, sounds, mixer_format):
+    # images: {key: Surface}, sounds: {path: Sound}; alpha images are stored in the
+    # byte order SDL displays normally use, so they can be blitted without converting
+    blobs = []
+    index = {"images": {}, "sounds": {}, "mixer": list(mixer_format) if mixer_format else None}
+    for key, surface in images.items():
+        pixel_format = "BGRA" if json.loads(key)[1] else "RGB"
+        blobs.append(("images", key, pygame.image.tobytes(surface, pixel_format), surface.get_size(), pixel_format))
+    for sound_path, sound in sounds.items():
+        blobs.append(("sounds", sound_path, sound.get_raw(), None, None))
+
+    # Offsets depend on the index length, so lay the index out until it stops growing
+    index_length = 0
+    while True:
+        offset = PACK_PREAMBLE.size + index_length
+        for kind, key, data, size, pixel_format in blobs:
+            offset += -offset % PACK_ALIGNMENT
+            if kind == "images":
+                index[kind][key] = [offset, len(data), size[0], size[1], pixel_format]
+            else:
+                index[kind][key] = [offset, len(data)]
+            offset += len(data)
+        encoded = json.dumps(index).encode("utf-8")
+        if len(encoded) <= index_length:
+            break
+        index_length = len(encoded) + 256
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(PACK_PREAMBLE.pack(PACK_MAGIC, PACK_VERSION, index_length))
+        handle.write(encoded.ljust(index_length))
+        for kind, key, data, _, _ in blobs:
+            handle.write(bytes(index[kind][key][0] - handle.tell()))
+            handle.write(data)
+    os.replace(temp_path, path)
+    return offset
+
+
+class AssetRegistry:
+    def __init__(self):
+        self.images = {}
+        self.sounds = {}
+        self.pack = None
+        # Surfaces decoded off the main thread, waiting to be converted on first use
+        self.decoded = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, alpha=False, scale=None, size=None, flip_x=False):
+        key = (path, alpha, scale, size, flip_x)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        if self.pack is not None:
+            image = self.pack.image(pack_key(path, alpha, scale, size, flip_x))
+            if image is not None:
+                image = self._prepare_packed(image, alpha)
+                self.images[key] = image
+                return image
+        if scale is None and size is None and not flip_x:
+            with self.lock:
+                image = self.decoded.pop(path, None)
+            if image is None:
+                image = pygame.image.load(path)
+            # Surfaces can only be converted once a display mode exists
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha() if alpha else image.convert()
+        else:
+            image = self.image(path, alpha)
+            if scale is not None:
+                size = (max(1, int(image.get_width() * scale)), max(1, int(image.get_height() * scale)))
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            if flip_x:
+                image = pygame.transform.flip(image, True, False)
+        self.images[key] = image
+        return image
+
+    def _prepare_packed(self, image, alpha):
+        display = pygame.display.get_surface()
+        if display is None:
+            return image
+        # Packed alpha sprites usually already match the display layout; only convert when they do not
+        if alpha and image.get_bitsize() == display.get_bitsize() and image.get_masks()[:3] == display.get_masks()[:3]:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    def open_pack(self, path=ASSET_PACK_PATH):
+        self.pack = AssetPack.open(path)
+        return self.pack is not None
+
+    def sound(self, path):
+        # Headless runs have no mixer; callers treat a missing sound as silence
+        if pygame.mixer.get_init() is None:
+            return None
+        with self.lock:
+            sound = self.sounds.get(path)
+            if sound is not None:
+                self.hits += 1
+                return sound
+            self.misses += 1
+            sound = self.pack.sound(path) if self.pack is not None else None
+            if sound is None:
+                sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+            return sound
+
+    def preload(self, images=(), sounds=()):
+        for args in images:
+            self.image(*args)
+        for path in sounds:
+            self.sound(path)
+
+    def warm(self, images=(), sounds=()):
+        # Safe to call from a background thread: only decodes files, the main thread converts them later
+        for args in images:
+            path = args[0]
+            if self.pack is not None and self.pack.has_image(pack_key(*args)):
+                continue
+            loaded = (path, False, None, None, False) in self.images or (path, True, None, None, False) in self.images
+            with self.lock:
+                if loaded or path in self.decoded:
+                    continue
+            image = pygame.image.load(path)
+            with self.lock:
+                self.decoded.setdefault(path, image)
+        for path in sounds:
+            self.sound(path)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self.images),
+            "sounds": len(self.sounds),
+        }
+
+
+ASSETS = AssetRegistry()
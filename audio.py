@@ -0,0 +1,130 @@
+import pygame
+from assets import ASSETS
+
+# Group name -> (reserved channels, steal the oldest voice when the group is full)
+CHANNEL_GROUPS = {
+    "barks": (4, True),
+    "effects": (2, True),
+    "stingers": (2, False),
+}
+
+
+class AudioManager:
+    enabled = True
+
+    def __init__(self, groups=CHANNEL_GROUPS, assets=ASSETS):
+        self.assets = assets
+        total = sum(size for size, _ in groups.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # Reserved channels are never picked by Sound.play(), so only this manager uses them
+        pygame.mixer.set_reserved(total)
+        self.groups = {}
+        self.steals = {}
+        first = 0
+        for name, (size, steal) in groups.items():
+            self.groups[name] = [pygame.mixer.Channel(index) for index in range(first, first + size)]
+            self.steals[name] = steal
+            first += size
+        self.sounds = {}
+        self.voices = {}
+        self.started = {}
+        self.sequence = 0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def register(self, path, group, max_voices=None):
+        sound = self.assets.sound(path)
+        if sound is None:
+            return
+        if max_voices is None:
+            max_voices = len(self.groups[group])
+        self.sounds[path] = (sound, group, max_voices)
+        self.voices.setdefault(path, [])
+
+    def register_all(self, sounds):
+        for path, group, max_voices in sounds:
+            self.register(path, group, max_voices)
+
+    def _oldest(self, channels):
+        return min(channels, key=lambda channel: self.started.get(channel, -1))
+
+    def play(self, path):
+        entry = self.sounds.get(path)
+        if entry is None:
+            self.dropped += 1
+            return False
+        sound, group, max_voices = entry
+        voices = self.voices[path]
+        voices[:] = [channel for channel in voices if channel.get_busy() and channel.get_sound() is sound]
+        if len(voices) >= max_voices:
+            channel = self._oldest(voices)
+            voices.remove(channel)
+            self.stolen += 1
+        else:
+            channels = self.groups[group]
+            channel = next((channel for channel in channels if not channel.get_busy()), None)
+            if channel is None:
+                if not self.steals[group]:
+                    self.dropped += 1
+                    return False
+                channel = self._oldest(channels)
+                self.stolen += 1
+                if channel in voices:
+                    voices.remove(channel)
+        channel.play(sound)
+        self.sequence += 1
+        self.started[channel] = self.sequence
+        voices.append(channel)
+        self.played += 1
+        return True
+
+    def active_voices(self):
+        return sum(channel.get_busy() for channels in self.groups.values() for channel in channels)
+
+    def stop(self):
+        for channels in self.groups.values():
+            for channel in channels:
+                channel.stop()
+
+    def stats(self):
+        return {
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+            "active": self.active_voices(),
+        }
+
+
+class NullAudio:
+    enabled = False
+
+    def __init__(self):
+        self.dropped = 0
+
+    def register(self, path, group, max_voices=None):
+        pass
+
+    def register_all(self, sounds):
+        pass
+
+    def play(self, path):
+        self.dropped += 1
+        return False
+
+    def active_voices(self):
+        return 0
+
+    def stop(self):
+        pass
+
+    def stats(self):
+        return {"played": 0, "stolen": 0, "dropped": self.dropped, "active": 0}
+
+
+def create_audio(groups=CHANNEL_GROUPS):
+    # Without an audio device the mixer never initialises; fall back to silence
+    if pygame.mixer.get_init() is None:
+        return NullAudio()
+    return AudioManager(groups)
@@ -0,0 +1,98 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from characters import Bark, BossCat, Cat, CatSwarm, Dog
+from events import check_collisions
+
+CAT_COUNTS = (10, 100, 1000)
+BARKS = 8
+REPEATS = 20
+
+
+def check_collisions_bruteforce(dog, cats):
+    # The original full scan, kept as the reference result and timing
+    for bark in dog.barks:
+        if bark.active:
+            for px, py in bark.projectiles:
+                for cat in cats:
+                    if cat.active and cat.x < px < cat.x + cat.width and cat.y < py < cat.y + cat.height:
+                        bark.active = False
+                        if isinstance(cat, BossCat):
+                            cat.hit_by_bark()
+                            if cat.health <= 0:
+                                dog.destroyed_boss = True
+                        else:
+                            cat.hit_by_bark()
+                            if not cat.active:
+                                dog.cats_destroyed += 1
+                        break
+    return [cat for cat in cats if cat.active]
+
+
+def build_scenario(seed, cat_count):
+    rng = random.Random(seed)
+    dog = Dog(320, 400, 7, (255, 0, 0), 45)
+    cats = CatSwarm(cat_count)
+    for index in range(cat_count):
+        x = rng.uniform(10, 570)
+        y = rng.uniform(40, 380)
+        if index == 0:
+            cats.spawn(BossCat, x, y, (200, 100, 50), 5.0, 3)
+        else:
+            cats.spawn(Cat, x, y, (0, 0, 255), 2.0)
+    for _ in range(BARKS):
+        dog.barks.append(Bark(rng.uniform(10, 630), rng.uniform(60, 400), 45))
+    return dog, cats
+
+
+def outcome(dog, cats):
+    return (
+        dog.cats_destroyed,
+        dog.destroyed_boss,
+        [bark.active for bark in dog.barks],
+        [(cat.health, cat.active) for cat in cats],
+    )
+
+
+def time_check(function, cat_count):
+    scenarios = [build_scenario(seed, cat_count) for seed in range(REPEATS)]
+    start = time.perf_counter()
+    for dog, cats in scenarios:
+        function(dog, cats)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def run():
+    pygame.mixer.init()
+    results = []
+    for cat_count in CAT_COUNTS:
+        for seed in range(REPEATS):
+            expected_dog, expected_cats = build_scenario(seed, cat_count)
+            actual_dog, actual_cats = build_scenario(seed, cat_count)
+            expected_all = list(expected_cats)
+            actual_all = list(actual_cats)
+            check_collisions_bruteforce(expected_dog, expected_cats)
+            check_collisions(actual_dog, actual_cats)
+            if outcome(expected_dog, expected_all) != outcome(actual_dog, actual_all):
+                raise AssertionError(f"grid result differs from full scan for {cat_count} cats, seed {seed}")
+        bruteforce = time_check(check_collisions_bruteforce, cat_count)
+        grid = time_check(check_collisions, cat_count)
+        results.append((cat_count, bruteforce, grid))
+    return results
+
+
+def main():
+    print(f"{'cats':>6} {'full scan ms':>14} {'grid ms':>10} {'speedup':>9}")
+    for cat_count, bruteforce, grid in run():
+        print(f"{cat_count:>6} {bruteforce * 1000:>14.3f} {grid * 1000:>10.3f} {bruteforce / grid:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from characters import Cat, CatSwarm
+from game import GameState, chase_bot
+from settings import DEFAULT_SETTINGS
+
+WAVE_SIZE = 10000
+SESSION_FRAMES = 30000
+SESSION_SAMPLES = 6
+
+
+def wave(cat_count=WAVE_SIZE):
+    # Sprites live in the asset registry, not in the cats; load them outside the trace
+    Cat(0, 0, (0, 0, 255), 2.0)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    cats = CatSwarm()
+    for index in range(cat_count):
+        cats.spawn(Cat, 20 + (index % 20) * 28, 40 + (index // 20) * 8, (0, 0, 255), 2.0)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cats": len(cats),
+        "bytes_per_cat": (current - before) / cat_count,
+        "total_mb": (current - before) / 2 ** 20,
+        "peak_mb": (peak - before) / 2 ** 20,
+    }
+
+
+def session(frames=SESSION_FRAMES, samples=SESSION_SAMPLES):
+    # Back-to-back games with fast spawns; a new game starts whenever one ends, so
+    # anything a finished game leaves behind shows up as growth between samples
+    settings = dict(DEFAULT_SETTINGS, CAT_SPAWN_INTERVAL=10, CATS_BEFORE_BOSS=10 ** 6)
+    state = GameState(settings, seed=0)
+    games = 1
+    interval = frames // samples
+    readings = []
+    tracemalloc.start()
+    for frame in range(1, frames + 1):
+        if state.finished:
+            state = GameState(settings, seed=games)
+            games += 1
+        state.step(chase_bot(state))
+        if frame % interval == 0:
+            readings.append((frame, tracemalloc.get_traced_memory()[0]))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return readings, peak, games
+
+
+def main():
+    pygame.display.init()
+    result = wave()
+    print(f"{result['cats']} cats: {result['bytes_per_cat']:.0f} bytes per cat, "
+          f"{result['total_mb']:.2f} MB held, {result['peak_mb']:.2f} MB peak while spawning")
+    readings, peak, games = session()
+    print(f"{'frame':>8} {'traced MB':>10}")
+    for frame, traced in readings:
+        print(f"{frame:>8} {traced / 2 ** 20:>10.3f}")
+    growth = readings[-1][1] - readings[1][1]
+    print(f"{games} games, peak {peak / 2 ** 20:.3f} MB, growth after warm-up {growth / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
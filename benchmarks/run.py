@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from assets import ASSETS
+from characters import BossCat, Cat
+from game import NO_INPUT, EndlessState, GameState, Inputs, chase_bot
+from rendering import draw_entities
+from replay import Recording
+from settings import DEFAULT_SETTINGS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BACKGROUND_PATH = 'visuals/Background_v2_640x480.png'
+DEFAULT_TOLERANCE = 0.25
+
+
+def make_state(seed, **overrides):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(overrides)
+    return GameState(settings, seed=seed)
+
+
+def steady_wave(seed):
+    # The normal game with the scripted bot playing until it dies or wins
+    return make_state(seed), chase_bot, 5000, None
+
+
+def swarm(seed, cat_count=400):
+    # A dense grid of tough cats under constant fire from a dog that never cools down.
+    # The food is parked off-screen so no cat gets its health reset by eating it.
+    state = make_state(seed, CAT_SPAWN_INTERVAL=10 ** 9, GLOBAL_CAT_SPEED=1.0, MAX_CAT_SPEED=1.0, FOOD_LEVELS_BEFORE_DOG=10)
+    state.dog.bark_cooldown = 0
+    for index in range(cat_count):
+        cat = state.cats.spawn(Cat, 20 + (index % 20) * 28, 40 + (index // 20) * 8, (0, 0, 255), 1.0)
+        cat.health = 10 ** 6
+
+    def sweep(state):
+        return Inputs(state.frame % 120 < 60, state.frame % 120 >= 60, True)
+
+    return state, sweep, 500, None
+
+
+def boss_fight(seed):
+    # The boss spawns straight away and soaks up barks for the whole run
+    state = make_state(
+        seed,
+        CATS_BEFORE_BOSS=0,
+        BOSS_CAT_HEALTH=10 ** 6,
+        GLOBAL_CAT_SPEED=1.0,
+        MAX_CAT_SPEED=1.0,
+        FOOD_LEVELS_BEFORE_DOG=10,
+    )
+    state.dog.bark_cooldown = 0
+    return state, chase_bot, 2000, None
+
+
+def food_enlargement(seed, cats_per_tick=4):
+    # Drop fresh cats onto the food every tick so each one takes the enlargement path
+    state = make_state(seed, CAT_SPAWN_INTERVAL=10 ** 9)
+    food = state.food
+
+    def feed(state):
+        for cat in state.cats:
+            if cat.enlarged:
+                cat.active = False
+        for index in range(cats_per_tick):
+            state.cats.spawn(Cat, food.x + index * 5, food.y, (0, 0, 255), 2.0)
+
+    return state, lambda state: NO_INPUT, 1000, feed
+
+
+def boss_in_swarm(seed):
+    # Boss plus regular cats, to keep the BossCat branch of check_collisions hot
+    state, controller, frames, hook = swarm(seed, cat_count=200)
+    state.cats.spawn(BossCat, 10, 140, (200, 100, 50), 5.0, 10 ** 6)
+    return state, controller, frames, hook
+
+
+def endless_waves(seed):
+    # Endless mode long enough for the waves to fill the screen up to the cat cap
+    return EndlessState(dict(DEFAULT_SETTINGS), seed=seed), chase_bot, 6000, None
+
+
+def replay_scenario(path):
+    # A session recorded with main.py --record; it brings its own seed and settings
+    recording = Recording.load(path)
+
+    def scenario(seed):
+        return recording.new_state(), recording.controller, len(recording), None
+
+    return scenario
+
+
+SCENARIOS = {
+    "steady_wave": steady_wave,
+    "swarm": swarm,
+    "boss_fight": boss_fight,
+    "food_enlargement": food_enlargement,
+    "boss_in_swarm": boss_in_swarm,
+    "endless_waves": endless_waves,
+}
+
+
+def run_scenario(name, seed, screen, background):
+    state, controller, max_frames, hook = SCENARIOS[name](seed)
+    phases = {phase_name: 0.0 for phase_name, _ in state.phases}
+    phases["hook"] = 0.0
+    phases["render"] = 0.0
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    while state.frame < max_frames and not state.finished:
+        if hook is not None:
+            began = perf_counter()
+            hook(state)
+            phases["hook"] += perf_counter() - began
+        if state.begin_step(controller(state)):
+            for phase_name, phase in state.phases:
+                began = perf_counter()
+                phase()
+                phases[phase_name] += perf_counter() - began
+                if state.finished:
+                    break
+        began = perf_counter()
+        screen.blit(background, (0, 0))
+        draw_entities(screen, state)
+        pygame.display.flip()
+        phases["render"] += perf_counter() - began
+    elapsed = perf_counter() - start
+    return {
+        "frames": state.frame,
+        "seconds": round(elapsed, 4),
+        "fps": round(state.frame / elapsed, 1),
+        "cats_destroyed": state.dog.cats_destroyed,
+        "phases_ms": {phase_name: round(total * 1000, 3) for phase_name, total in phases.items()},
+    }
+
+
+def run(names, seed):
+    pygame.display.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((640, 480))
+    background = ASSETS.image(BACKGROUND_PATH)
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, seed, screen, background)
+    pygame.quit()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        floor = expected["fps"] * (1 - tolerance)
+        if result["fps"] < floor:
+            regressions.append(f"{name}: {result['fps']} fps, baseline {expected['fps']} fps (floor {floor:.1f})")
+        if result["frames"] != expected["frames"] or result["cats_destroyed"] != expected["cats_destroyed"]:
+            regressions.append(f"{name}: simulation diverged from baseline ({result['frames']} frames, {result['cats_destroyed']} cats destroyed)")
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Seeded, headless performance scenarios for the game loop.")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed fps drop against the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--replay", action="append", default=[], metavar="FILE", help="also run a recorded session (repeatable)")
+    options = parser.parse_args(args)
+    for path in options.replay:
+        SCENARIOS[f"replay:{os.path.basename(path)}"] = replay_scenario(path)
+    unknown = [name for name in options.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    results = run(options.scenarios or list(SCENARIOS), options.seed)
+    report = json.dumps(results, indent=2)
+    print(report)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as handle:
+            handle.write(report)
+
+    if options.update_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+        return 0
+    if not os.path.exists(options.baseline):
+        return 0
+    with open(options.baseline, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions = compare(results, baseline, options.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from assets import ASSET_PACK_PATH, AssetRegistry, pack_key, write_pack
+from main import LOGICAL_SIZE, MENU_BACKGROUND_PATH, game_assets
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Pack every game image variant and sound into one pre-decoded file.")
+    parser.add_argument("--output", default=ASSET_PACK_PATH)
+    options = parser.parse_args(args)
+
+    pygame.display.init()
+    # Sounds are stored as PCM in the mixer's default format, the one main.py asks for
+    pygame.mixer.init()
+    images, sounds, _ = game_assets()
+    images = images + [(MENU_BACKGROUND_PATH, False, None, LOGICAL_SIZE)]
+    # A registry without a pack, so everything is decoded from the loose files
+    registry = AssetRegistry()
+    surfaces = {pack_key(*args): registry.image(*args) for args in images}
+    decoded_sounds = {path: registry.sound(path) for path in sounds}
+    size = write_pack(options.output, surfaces, decoded_sounds, pygame.mixer.get_init())
+    print(f"Wrote {len(surfaces)} images and {len(decoded_sounds)} sounds to {options.output} ({size / 2 ** 20:.1f} MB)")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 import pygame
 import math
+import numpy as np
+from assets import ASSETS
+
+# Facing codes shared by the dog, the cats and the swarm arrays
+LEFT = -1
+RIGHT = 1
 
 
 class Character:
+    # Cat overrides the position fields with properties that read its swarm's arrays
+    __slots__ = ('x', 'y', 'previous_x', 'previous_y', 'width', 'height', 'speed', 'color')
+
     def __init__(self, x, y, speed, color):
         self.x = x
         self.y = y
+        self.previous_x = x
+        self.previous_y = y
         self.speed = speed
         self.color = color
         self.width = 40
@@ -15,43 +26,115 @@ class Character:
         self.x += dx * self.speed
         self.y += dy * self.speed
 
+    def remember(self):
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+    def render_position(self, alpha=1.0):
+        # Blend between the last two simulation ticks for smooth rendering
+        return (
+            self.previous_x + (self.x - self.previous_x) * alpha,
+            self.previous_y + (self.y - self.previous_y) * alpha,
+        )
+
     def draw(self, screen):
         pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
 
 
+class ProjectilePool:
+    BLOCK_SIZE = 8
+
+    def __init__(self, blocks=16):
+        self.capacity = 0
+        self.free_blocks = []
+        self._resize(max(1, blocks) * ProjectilePool.BLOCK_SIZE)
+
+    def _resize(self, capacity):
+        for name in ('x', 'y'):
+            array = np.zeros(capacity, dtype=np.float64)
+            if self.capacity:
+                array[:self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        first_new_block = self.capacity // ProjectilePool.BLOCK_SIZE
+        self.free_blocks.extend(range(capacity // ProjectilePool.BLOCK_SIZE - 1, first_new_block - 1, -1))
+        self.capacity = capacity
+
+    def claim(self):
+        if not self.free_blocks:
+            self._resize(self.capacity * 2)
+        return self.free_blocks.pop() * ProjectilePool.BLOCK_SIZE
+
+    def release(self, start):
+        self.free_blocks.append(start // ProjectilePool.BLOCK_SIZE)
+
+
 class Bark:
-    def __init__(self, x, y, speed):
+    __slots__ = ('pool', 'start', 'stop', 'speed', 'active', 'released')
+    SOUND_PATH = 'sounds/woof_morty_1.wav'
+    SPACING = np.arange(ProjectilePool.BLOCK_SIZE) * 10
+    RADIUS = 5
+    _sprite = None
+
+    @staticmethod
+    def sprite():
+        # One pre-rendered projectile shared by every bark
+        if Bark._sprite is None:
+            size = Bark.RADIUS * 2
+            Bark._sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(Bark._sprite, (255, 255, 0), (Bark.RADIUS, Bark.RADIUS), Bark.RADIUS)
+        return Bark._sprite
+
+    def __init__(self, x, y, speed, pool=None):
+        self.pool = pool if pool is not None else ProjectilePool(1)
+        self.start = self.pool.claim()
+        self.stop = self.start + ProjectilePool.BLOCK_SIZE
         # Initial positions of projectiles are spaced vertically
-        self.projectiles = [(x, y - i * 10) for i in range(8)]
+        self.pool.x[self.start:self.stop] = x
+        np.subtract(y, Bark.SPACING, out=self.pool.y[self.start:self.stop])
         self.speed = speed
         self.active = True
-        self.bark_sound = pygame.mixer.Sound('sounds/woof_morty_1.wav')
-        self.bark_sound.play()
+        self.released = False
+
+    @property
+    def projectiles(self):
+        return list(zip(self.pool.x[self.start:self.stop].tolist(), self.pool.y[self.start:self.stop].tolist()))
 
     def move(self):
         # Update all projectiles to move upward
-        self.projectiles = [(px, py - self.speed) for px, py in self.projectiles]
+        self.pool.y[self.start:self.stop] -= self.speed
+
+    def on_screen(self):
+        return self.pool.y[self.start:self.stop].max() > 0
+
+    def release(self):
+        if not self.released:
+            self.pool.release(self.start)
+            self.released = True
+
+    def sprites(self):
+        sprite = Bark.sprite()
+        radius = Bark.RADIUS
+        xs = self.pool.x[self.start:self.stop].tolist()
+        ys = self.pool.y[self.start:self.stop].tolist()
+        return [(sprite, (x - radius, y - radius)) for x, y in zip(xs, ys)]
 
     def draw(self, screen):
         if self.active:
-            for px, py in self.projectiles:
-                pygame.draw.circle(screen, (255, 255, 0), (px, py), 5)
+            screen.blits(self.sprites(), False)
 
 
 class Food:
+    __slots__ = ('image', 'sound_path', 'width', 'height', 'x', 'y')
+
     def __init__(self, x, y, image_path=None, sound_path=None, scale=1.0):
         self.image = None
-        self.sound = None
+        self.sound_path = sound_path
         if image_path:
             try:
-                self.image = pygame.image.load(image_path)
+                self.image = ASSETS.image(image_path, scale=scale if scale != 1.0 else None)
             except pygame.error:
                 self.image = None
         if self.image:
-            if scale != 1.0:
-                new_width = max(1, int(self.image.get_width() * scale))
-                new_height = max(1, int(self.image.get_height() * scale))
-                self.image = pygame.transform.scale(self.image, (new_width, new_height))
             self.width = self.image.get_width()
             self.height = self.image.get_height()
         else:
@@ -59,12 +142,6 @@ class Food:
             self.height = 20
         self.x = x
         self.y = y
-        if sound_path:
-            self.sound = pygame.mixer.Sound(sound_path)
-
-    def play_sound(self):
-        if self.sound:
-            self.sound.play()
 
     def draw(self, screen):
         if self.image:
@@ -72,82 +149,250 @@ class Food:
         else:
             pygame.draw.rect(screen, (100, 255, 100), (self.x, self.y, self.width, self.height))
 
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
 
 class Dog(Character):
+    __slots__ = (
+        'barks', 'projectile_pool',
+        'bark_speed', 'bark_cooldown', 'last_bark_time', 'cats_destroyed', 'destroyed_boss', 'position',
+    )
+    IMAGE_PATH = 'visuals/Morty_64x60.png'
+
     def __init__(self, x, y, speed, color, bark_speed):
         super().__init__(x, y, speed, color)
         self.barks = []
+        self.projectile_pool = ProjectilePool()
         self.bark_speed = bark_speed
         self.bark_cooldown = 350  # Cooldown in milliseconds (1.5 seconds)
         self.last_bark_time = pygame.time.get_ticks() - self.bark_cooldown  # Initialize to allow immediate bark
         self.cats_destroyed = 0
-        self.image = pygame.image.load('visuals/Morty_64x60.png')
         self.destroyed_boss = False
-        self.position = 'right'
+        self.position = RIGHT
 
-    def draw_img(self, screen):
-        if self.position == 'left':
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            screen.blit(flipped_image, (self.x, self.y))
-        else:
-            screen.blit(self.image, (self.x, self.y))
+    @property
+    def image(self):
+        return ASSETS.image(Dog.IMAGE_PATH, alpha=True)
 
-    def bark(self):
-        current_time = pygame.time.get_ticks()
+    def sprite(self):
+        # Mirrored variant comes from the registry cache; nothing is flipped per frame
+        return ASSETS.image(Dog.IMAGE_PATH, alpha=True, flip_x=self.position == LEFT)
+
+    def draw_img(self, screen, alpha=1.0):
+        screen.blit(self.sprite(), self.render_position(alpha))
+
+    def bark(self, current_time=None):
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         if current_time - self.last_bark_time > self.bark_cooldown:
-            self.barks.append(Bark(self.x + 20, self.y + 10, self.bark_speed))
+            self.barks.append(Bark(self.x + 20, self.y + 10, self.bark_speed, self.projectile_pool))
             self.last_bark_time = current_time
+            return True
+        return False
 
     def update_barks(self):
-        for bark in self.barks:
+        barks = self.barks
+        kept = 0
+        for bark in barks:
             bark.move()
             # Deactivate bark if all projectiles are off screen
-            if not any(py > 0 for _, py in bark.projectiles):
+            if not bark.on_screen():
                 bark.active = False
-        # Filter out inactive barks
-        self.barks = [bark for bark in self.barks if bark.active]
+            # Filter out inactive barks in place, handing their slots back to the pool
+            if bark.active:
+                barks[kept] = bark
+                kept += 1
+            else:
+                bark.release()
+        del barks[kept:]
 
     def draw(self, screen):
         super().draw(screen)
         for bark in self.barks:
             bark.draw(screen)
 
+class CatSwarm:
+    LEFT = LEFT
+    RIGHT = RIGHT
+    FIELDS = (
+        ('x', np.float64),
+        ('y', np.float64),
+        ('previous_x', np.float64),
+        ('previous_y', np.float64),
+        ('direction', np.int8),
+        ('width', np.int32),
+        ('height', np.int32),
+        ('health', np.int32),
+        ('enlarged', np.bool_),
+        ('active', np.bool_),
+    )
+
+    def __init__(self, capacity=64):
+        self.cats = []
+        self.count = 0
+        self.capacity = 0
+        # Live BossCats, kept so spawning never has to scan the swarm
+        self.bosses = 0
+        self._resize(max(1, capacity))
+
+    def _resize(self, capacity):
+        for name, dtype in CatSwarm.FIELDS:
+            array = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __iter__(self):
+        return iter(self.cats)
+
+    def __len__(self):
+        return self.count
+
+    def _append(self, cat):
+        if self.count == self.capacity:
+            self._resize(self.capacity * 2)
+        cat.swarm = self
+        cat.index = self.count
+        self.cats.append(cat)
+        self.count += 1
+        if isinstance(cat, BossCat):
+            self.bosses += 1
+
+    def spawn(self, cat_type, *args):
+        # Builds a cat straight into this swarm's arrays, without storage of its own first
+        cat = cat_type.__new__(cat_type)
+        self._append(cat)
+        cat.__init__(*args)
+        return cat
+
+    def remember(self):
+        self.previous_x[:self.count] = self.x[:self.count]
+        self.previous_y[:self.count] = self.y[:self.count]
+
+    def sprites(self, alpha=1.0):
+        # (surface, position) pairs for every cat, ready for Surface.blits
+        count = self.count
+        if not count:
+            return []
+        previous_x = self.previous_x[:count]
+        previous_y = self.previous_y[:count]
+        xs = (previous_x + (self.x[:count] - previous_x) * alpha).tolist()
+        ys = (previous_y + (self.y[:count] - previous_y) * alpha).tolist()
+        variants = Cat.sprite_variants()
+        keys = ((self.direction[:count] == LEFT) + 2 * self.enlarged[:count]).tolist()
+        return list(zip(map(variants.__getitem__, keys), zip(xs, ys)))
+
+    def step(self, global_speed, screen_width, start=0, stop=None):
+        if stop is None:
+            stop = self.count
+        x = self.x[start:stop]
+        y = self.y[start:stop]
+        direction = self.direction[start:stop]
+        active = self.active[start:stop]
+        moved_x = x + direction * global_speed
+        fits = np.where(direction == CatSwarm.LEFT, moved_x > 10, moved_x < screen_width - self.width[start:stop] - 10)
+        turning = active & ~fits
+        np.copyto(x, moved_x, where=active & fits)
+        y[turning] += Cat.VERTICAL_MOVE
+        direction[turning] *= -1
+
+    def compact(self):
+        keep = self.active[:self.count]
+        if keep.all():
+            return
+        keep = keep.copy()
+        cats = self.cats
+        self.cats = []
+        dropped = []
+        for cat, alive in zip(cats, keep.tolist()):
+            if alive:
+                self.cats.append(cat)
+            else:
+                dropped.append(cat)
+        # Dropped cats may still be referenced (barks, tests), so they share one
+        # swarm holding a copy of their rows instead of each getting storage
+        graveyard = CatSwarm(len(dropped))
+        dead = ~keep
+        for name, _ in CatSwarm.FIELDS:
+            getattr(graveyard, name)[:len(dropped)] = getattr(self, name)[:self.count][dead]
+        for cat in dropped:
+            graveyard._append(cat)
+        self.bosses -= graveyard.bosses
+        kept = len(self.cats)
+        for name, _ in CatSwarm.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+        for index, cat in enumerate(self.cats):
+            cat.index = index
+        self.count = kept
+
+
+def _swarm_field(name, cast):
+    def get(self):
+        return cast(getattr(self.swarm, name)[self.index])
+
+    def set(self, value):
+        getattr(self.swarm, name)[self.index] = value
+
+    return property(get, set)
+
+
 class Cat(Character):
+    __slots__ = ('swarm', 'index')
     VERTICAL_MOVE = 50
     ENLARGE_SCALE = 1.5
+    IMAGE_PATH = 'visuals/Cat_ex1_64x57_right.png'
+
+    x = _swarm_field('x', float)
+    y = _swarm_field('y', float)
+    previous_x = _swarm_field('previous_x', float)
+    previous_y = _swarm_field('previous_y', float)
+    width = _swarm_field('width', int)
+    height = _swarm_field('height', int)
+    health = _swarm_field('health', int)
+    enlarged = _swarm_field('enlarged', bool)
+    active = _swarm_field('active', bool)
 
     def __init__(self, x, y, color, speed):
+        # CatSwarm.spawn attaches the cat before this runs; a cat made on its own gets a swarm of one
+        if not hasattr(self, 'swarm'):
+            CatSwarm(1)._append(self)
         super().__init__(x, y, speed, color)
         self.active = True
-        self.direction = 'left'
-        self.vertical_move = Cat.VERTICAL_MOVE
+        self.direction = LEFT
         self.enlarged = False
-        self.image = pygame.image.load('visuals/Cat_ex1_64x57_right.png')
         self.health = 1
 
+    direction = _swarm_field('direction', int)
+
+    @property
+    def image(self):
+        # Every cat shares the two registry sprites; nothing is stored per instance
+        if self.enlarged:
+            return ASSETS.image(Cat.IMAGE_PATH, alpha=True, scale=Cat.ENLARGE_SCALE)
+        return ASSETS.image(Cat.IMAGE_PATH, alpha=True)
+
     def descend(self, global_speed, screen_width, screen_height):
-        if not self.active:
-            return
+        self.swarm.step(global_speed, screen_width, self.index, self.index + 1)
 
-        if self.direction == 'left':
-            if self.x - global_speed > 10:
-                self.x -= global_speed
-            else:
-                self.y += self.vertical_move
-                self.direction = 'right'
-        elif self.direction == 'right':
-            if self.x + global_speed < screen_width - self.width - 10:
-                self.x += global_speed
-            else:
-                self.y += self.vertical_move
-                self.direction = 'left'
+    @staticmethod
+    def sprite_variants():
+        # Indexed by facing_left + 2 * enlarged
+        return (
+            ASSETS.image(Cat.IMAGE_PATH, alpha=True),
+            ASSETS.image(Cat.IMAGE_PATH, alpha=True, flip_x=True),
+            ASSETS.image(Cat.IMAGE_PATH, alpha=True, scale=Cat.ENLARGE_SCALE),
+            ASSETS.image(Cat.IMAGE_PATH, alpha=True, scale=Cat.ENLARGE_SCALE, flip_x=True),
+        )
 
-    def draw(self, screen):
-        if self.direction == 'left':
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            screen.blit(flipped_image, (self.x, self.y))
-        else:
-            screen.blit(self.image, (self.x, self.y))
+    def sprite(self):
+        scale = Cat.ENLARGE_SCALE if self.enlarged else None
+        return ASSETS.image(Cat.IMAGE_PATH, alpha=True, scale=scale, flip_x=self.direction == LEFT)
+
+    def draw(self, screen, alpha=1.0):
+        screen.blit(self.sprite(), self.render_position(alpha))
 
     def hit_by_bark(self):
         self.health -= 1
@@ -156,20 +401,19 @@ class Cat(Character):
 
     def check_food(self, food):
         if not self.enlarged and self.x < food.x + food.width and self.x + self.width > food.x and self.y < food.y + food.height and self.y + self.height > food.y:
-            self.enlarged = True
-            food.play_sound()
             old_image_height = self.image.get_height()
+            self.enlarged = True
             self.width = int(self.width * Cat.ENLARGE_SCALE)
             self.height = int(self.height * Cat.ENLARGE_SCALE)
-            print('Collision Detected')
-            new_image_width = int(self.image.get_width() * Cat.ENLARGE_SCALE)
-            new_image_height = int(self.image.get_height() * Cat.ENLARGE_SCALE)
-            self.image = pygame.transform.scale(self.image, (new_image_width, new_image_height))
-            self.y -= (new_image_height - old_image_height)
+            self.y -= (self.image.get_height() - old_image_height)
             self.health = 9
+            return True
+        return False
 
 
 class BossCat(Cat):
+    __slots__ = ()
+
     def __init__(self, x, y, color, speed, health):
         super().__init__(x, y, color, speed)
         self.health = health
@@ -1,4 +1,5 @@
-from characters import BossCat, Cat
+import numpy as np
+from characters import BossCat, Cat, CatSwarm
 
 class DogCollision:
     @staticmethod
@@ -13,11 +14,70 @@ class DogCollision:
     def collides(cls, cat, dog):
         return cls.same_level(cat, dog) and cls.overlaps_x(cat, dog)
 
-def check_collisions(dog, cats):
+class CatGrid:
+    CELL_SIZE = 64
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.filled = False
+
+    def clear(self):
+        for bucket in self.cells.values():
+            bucket.clear()
+        self.filled = False
+
+    def rebuild(self, cats):
+        # Buckets are kept between frames and refilled in list order, so the
+        # first cat hit in a cell is the same one the full scan would find
+        self.clear()
+        self.filled = True
+        size = self.cell_size
+        if isinstance(cats, CatSwarm):
+            count = cats.count
+            x = cats.x[:count]
+            y = cats.y[:count]
+            spans = zip(
+                cats.cats,
+                np.floor_divide(x, size).astype(np.int64).tolist(),
+                np.floor_divide(x + cats.width[:count], size).astype(np.int64).tolist(),
+                np.floor_divide(y, size).astype(np.int64).tolist(),
+                np.floor_divide(y + cats.height[:count], size).astype(np.int64).tolist(),
+                cats.active[:count].tolist(),
+            )
+        else:
+            spans = (
+                (cat, int(cat.x // size), int((cat.x + cat.width) // size), int(cat.y // size), int((cat.y + cat.height) // size), cat.active)
+                for cat in cats
+            )
+        cells = self.cells
+        for cat, left, right, top, bottom, active in spans:
+            if not active:
+                continue
+            for column in range(left, right + 1):
+                for row in range(top, bottom + 1):
+                    bucket = cells.get((column, row))
+                    if bucket is None:
+                        bucket = cells[(column, row)] = []
+                    bucket.append(cat)
+
+    def candidates(self, px, py):
+        return self.cells.get((int(px // self.cell_size), int(py // self.cell_size)), ())
+
+def check_collisions(dog, cats, grid=None):
+    if grid is None:
+        grid = CatGrid()
+    if dog.barks:
+        grid.rebuild(cats)
+    elif grid.filled:
+        # Nothing to test this tick; drop last tick's cats rather than hold on to them
+        grid.clear()
     for bark in dog.barks:
         if bark.active:
-            for px, py in bark.projectiles:
-                for cat in cats:
+            xs = bark.pool.x[bark.start:bark.stop].tolist()
+            ys = bark.pool.y[bark.start:bark.stop].tolist()
+            for px, py in zip(xs, ys):
+                for cat in grid.candidates(px, py):
                     if cat.active and cat.x < px < cat.x + cat.width and cat.y < py < cat.y + cat.height:
                         bark.active = False
                         if isinstance(cat, BossCat):
@@ -29,10 +89,7 @@ def check_collisions(dog, cats):
                             if not cat.active:
                                 dog.cats_destroyed += 1
                         break  # Stop checking if bark has already hit a cat
+    if isinstance(cats, CatSwarm):
+        cats.compact()
+        return cats
     return [cat for cat in cats if cat.active]
-
-def boss_exists(cats):
-    for cat in cats:
-        if isinstance(cat, BossCat) and cat.active:
-            return True
-    return False
@@ -0,0 +1,326 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+from characters import LEFT, RIGHT, Bark, BossCat, Cat, CatSwarm, Dog, Food
+from events import CatGrid, DogCollision, check_collisions
+from profiler import NULL_PROFILER
+from scheduler import Scheduler
+
+TICK_MS = 20
+MAX_CATCH_UP_TICKS = 5
+FOOD_IMAGE_PATH = "visuals/8853301006071_compressed copy.jpg"
+FOOD_IMAGE_SCALE = 0.1
+FOOD_SOUND_PATH = "sounds/smw_power-up_appears.wav"
+FIRST_CAT_SPAWN_DELAY = 20
+# The dog stands this far above the bottom of the logical screen
+DOG_FLOOR_OFFSET = 80
+# Order of events due on the same tick: the boss blocks that tick's cat spawn,
+# and a ramp after the spawn leaves the new cat at the old speed
+EVENT_PRIORITIES = {"boss_spawn": 0, "cat_spawn": 1, "speed_ramp": 2}
+# Below this many cats a plain loop over all of them beats the numpy pre-filter
+CONTACT_FILTER_MIN_CATS = 32
+ENDLESS_MAX_CATS = 1000
+ENDLESS_WAVE_TICKS = 250
+ENDLESS_SPAWN_EVERY = 5
+ENDLESS_BOSS_EVERY = 3
+# Extra food across the food row, as fractions of the screen width
+ENDLESS_FOOD_POSITIONS = (0.15, 0.5, 0.85)
+
+Inputs = namedtuple("Inputs", ["left", "right", "bark"])
+NO_INPUT = Inputs(False, False, False)
+
+
+class GameState:
+    def __init__(self, settings, screen_width=640, seed=None, screen_height=480):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rng = np.random.default_rng(seed)
+        self.cat_spawn_interval = int(settings["CAT_SPAWN_INTERVAL"])
+        self.cats_before_boss = int(settings["CATS_BEFORE_BOSS"])
+        self.global_cat_speed = settings["GLOBAL_CAT_SPEED"]
+        self.max_cat_speed = settings["MAX_CAT_SPEED"]
+        self.boss_cat_speed = settings["BOSS_CAT_SPEED"]
+        self.boss_cat_health = int(settings["BOSS_CAT_HEALTH"])
+        self.speed_increase_interval = int(settings["SPEED_INCREASE_INTERVAL"])
+        food_levels_before_dog = int(settings["FOOD_LEVELS_BEFORE_DOG"])
+
+        self.frame = 0
+        self.time_ms = 0
+        self.game_over = False
+        self.game_over_time = None
+        self.won = False
+        self.inputs = NO_INPUT
+        # Sound paths triggered during the latest tick, for the caller to play
+        self.sounds = []
+        self.profiler = NULL_PROFILER
+        # Optional InputRecorder fed every tick's inputs, for --record
+        self.recorder = None
+        self.phases = (
+            ("input", self.apply_inputs),
+            ("barks", self.update_barks),
+            ("collisions", self.collide),
+            ("descend", self.descend),
+            ("scheduled", self.run_events),
+            ("food_and_dog", self.check_food_and_dog),
+        )
+        self.events = Scheduler()
+        self.handlers = {
+            "boss_spawn": self.spawn_boss,
+            "cat_spawn": self.spawn_cat,
+            "speed_ramp": self.ramp_speed,
+        }
+        self.schedule_cat_spawn(FIRST_CAT_SPAWN_DELAY)
+        # A ramp used to run at the start of the tick after the interval elapsed;
+        # the end of the tick before it is the same point in the simulation
+        self.speed_ramp_ticks = self.speed_increase_interval // TICK_MS + 1
+        self.schedule(self.speed_ramp_ticks - 1, "speed_ramp")
+        if self.cats_before_boss == 0:
+            self.schedule(1, "boss_spawn")
+
+        self.dog = Dog(screen_width // 2, screen_height - DOG_FLOOR_OFFSET, settings["DOG_SPEED"], (255, 0, 0), settings["BARK_SPEED"])
+        self.dog.last_bark_time = self.time_ms - self.dog.bark_cooldown
+        self.cats = CatSwarm()
+        self.food = Food(
+            int(settings["FOOD_X_BASE"]) + int(settings["FOOD_X_OFFSET"]),
+            self.dog.y - (food_levels_before_dog * Cat.VERTICAL_MOVE),
+            image_path=FOOD_IMAGE_PATH,
+            sound_path=FOOD_SOUND_PATH,
+            scale=FOOD_IMAGE_SCALE,
+        )
+        self.food.x -= self.food.width // 2
+        self.foods = [self.food]
+        self.grid = CatGrid()
+
+    @property
+    def finished(self):
+        return self.won or self.game_over
+
+    def begin_step(self, inputs):
+        self.frame += 1
+        self.time_ms += TICK_MS
+        self.inputs = inputs
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        self.sounds.clear()
+        self.dog.remember()
+        self.cats.remember()
+        return not self.finished
+
+    def step(self, inputs):
+        if not self.begin_step(inputs):
+            return
+        if not self.profiler.enabled:
+            for _, phase in self.phases:
+                phase()
+                if self.finished:
+                    break
+            return
+        for name, phase in self.phases:
+            with self.profiler.section(name):
+                phase()
+            if self.finished:
+                break
+
+    def schedule(self, ticks, name):
+        self.events.at(self.frame + ticks, name, EVENT_PRIORITIES.get(name, len(EVENT_PRIORITIES)))
+
+    def schedule_cat_spawn(self, timer):
+        # Same tick the old per-tick countdown from timer would have reached zero on
+        self.schedule(max(1, math.ceil(timer) + 1), "cat_spawn")
+
+    def run_events(self):
+        events = self.events
+        name = events.pop(self.frame)
+        while name is not None:
+            self.handlers[name]()
+            name = events.pop(self.frame)
+
+    def ramp_speed(self):
+        if self.global_cat_speed < self.max_cat_speed:
+            self.global_cat_speed += math.log(self.global_cat_speed + 1)
+        self.schedule(self.speed_ramp_ticks, "speed_ramp")
+
+    def apply_inputs(self):
+        dog = self.dog
+        if self.inputs.left:
+            dog.move(-1, 0)
+            dog.position = LEFT
+        if self.inputs.right:
+            dog.move(1, 0)
+            dog.position = RIGHT
+        if self.inputs.bark and dog.bark(self.time_ms):
+            self.sounds.append(Bark.SOUND_PATH)
+
+    def update_barks(self):
+        self.dog.update_barks()
+
+    def collide(self):
+        destroyed = self.dog.cats_destroyed
+        self.cats = check_collisions(self.dog, self.cats, grid=self.grid)
+        if self.dog.destroyed_boss:
+            self.won = True
+        elif self.dog.cats_destroyed != destroyed and self.dog.cats_destroyed == self.cats_before_boss and not self.cats.bosses:
+            self.schedule(0, "boss_spawn")
+
+    def descend(self):
+        self.cats.step(self.global_cat_speed, self.screen_width)
+
+    def spawn_boss(self):
+        if not self.cats.bosses:
+            self.cats.spawn(BossCat, 10, 140, (200, 100, 50), self.boss_cat_speed, self.boss_cat_health)
+
+    def spawn_cat(self):
+        # Regular spawns stop for good once the boss is out; the game ends with it
+        if self.cats.bosses:
+            return
+        x = int(self.rng.uniform(40, self.screen_width - 20))
+        self.cats.spawn(Cat, x, 40, (0, 0, 255), self.global_cat_speed)
+        self.schedule_cat_spawn(self.cat_spawn_interval + self.rng.normal(0, 60))
+
+    def contact_candidates(self, dog=True):
+        # Indices of cats that could touch a food or the dog this tick, in swarm order.
+        # Every other cat would fail both checks without side effects, so it is skipped.
+        cats = self.cats
+        count = cats.count
+        if count < CONTACT_FILTER_MIN_CATS:
+            return range(count)
+        x = cats.x[:count]
+        y = cats.y[:count]
+        right = x + cats.width[:count]
+        bottom = y + cats.height[:count]
+        hungry = ~cats.enlarged[:count]
+        touching = np.zeros(count, dtype=np.bool_)
+        for food in self.foods:
+            touching |= hungry & (x < food.x + food.width) & (right > food.x) & (y < food.y + food.height) & (bottom > food.y)
+        if dog:
+            dog = self.dog
+            touching |= (y >= dog.y - Cat.VERTICAL_MOVE) & (x < dog.x + dog.width) & (right > dog.x)
+        return np.flatnonzero(touching).tolist()
+
+    def check_food_and_dog(self):
+        cats = self.cats.cats
+        for index in self.contact_candidates():
+            cat = cats[index]
+            if cat.check_food(self.food) and self.food.sound_path:
+                self.sounds.append(self.food.sound_path)
+            if DogCollision.collides(cat, self.dog):
+                self.game_over = True
+                self.game_over_time = self.time_ms
+                break
+
+
+class FixedTimestep:
+    def __init__(self, tick_ms=TICK_MS, max_catch_up=MAX_CATCH_UP_TICKS):
+        self.tick_ms = tick_ms
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0
+        self.dropped_ms = 0
+
+    def advance(self, elapsed_ms):
+        # Returns how many simulation ticks are due for this rendered frame
+        self.accumulator += elapsed_ms
+        ticks = min(int(self.accumulator // self.tick_ms), self.max_catch_up)
+        self.accumulator -= ticks * self.tick_ms
+        if self.accumulator >= self.tick_ms:
+            # Too far behind to catch up; drop the backlog rather than spiral
+            backlog = self.accumulator - self.accumulator % self.tick_ms
+            self.dropped_ms += backlog
+            self.accumulator -= backlog
+        return ticks
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick_ms
+
+
+class EndlessState(GameState):
+    # Waves that grow without bound: more cats per spawn tick each wave, a boss every
+    # few waves, several foods. Cats that reach the dog's row are culled instead of
+    # ending the game, and live cats are capped at max_cats.
+    def __init__(self, settings, screen_width=640, seed=None, screen_height=480, max_cats=ENDLESS_MAX_CATS):
+        super().__init__(settings, screen_width, seed, screen_height)
+        self.max_cats = max_cats
+        self.wave = 0
+        self.wave_ends = 0
+        self.culled = 0
+        self.capped = 0
+        self.bosses_destroyed = 0
+        self.events.cancel("cat_spawn")
+        self.events.cancel("boss_spawn")
+        self.handlers["wave"] = self.start_wave
+        self.handlers["wave_spawn"] = self.spawn_wave
+        for fraction in ENDLESS_FOOD_POSITIONS:
+            food = Food(
+                int(screen_width * fraction), self.food.y,
+                image_path=FOOD_IMAGE_PATH, sound_path=FOOD_SOUND_PATH, scale=FOOD_IMAGE_SCALE,
+            )
+            food.x -= food.width // 2
+            self.foods.append(food)
+        self.schedule(1, "wave")
+
+    def room(self, wanted):
+        room = max(0, min(wanted, self.max_cats - len(self.cats)))
+        self.capped += wanted - room
+        return room
+
+    def start_wave(self):
+        self.wave += 1
+        self.wave_ends = self.frame + ENDLESS_WAVE_TICKS
+        for _ in range(self.room(self.wave // ENDLESS_BOSS_EVERY)):
+            x = int(self.rng.uniform(10, self.screen_width - 70))
+            self.cats.spawn(BossCat, x, 140, (200, 100, 50), self.boss_cat_speed, self.boss_cat_health)
+        self.spawn_wave()
+        self.schedule(ENDLESS_WAVE_TICKS, "wave")
+
+    def spawn_wave(self):
+        for _ in range(self.room(self.wave)):
+            x = int(self.rng.uniform(40, self.screen_width - 20))
+            self.cats.spawn(Cat, x, 40, (0, 0, 255), self.global_cat_speed)
+        if self.frame + ENDLESS_SPAWN_EVERY < self.wave_ends:
+            self.schedule(ENDLESS_SPAWN_EVERY, "wave_spawn")
+
+    def collide(self):
+        self.cats = check_collisions(self.dog, self.cats, grid=self.grid)
+        # A fallen boss is just a tougher kill here; the run carries on
+        if self.dog.destroyed_boss:
+            self.dog.destroyed_boss = False
+            self.bosses_destroyed += 1
+
+    def check_food_and_dog(self):
+        cats = self.cats.cats
+        for index in self.contact_candidates(dog=False):
+            cat = cats[index]
+            for food in self.foods:
+                if cat.check_food(food):
+                    if food.sound_path:
+                        self.sounds.append(food.sound_path)
+                    break
+        swarm = self.cats
+        count = swarm.count
+        active = swarm.active[:count]
+        escaped = active & (swarm.y[:count] >= self.dog.y - Cat.VERTICAL_MOVE)
+        culled = int(np.count_nonzero(escaped))
+        if culled:
+            active &= ~escaped
+            swarm.compact()
+            self.culled += culled
+
+
+def chase_bot(state):
+    # Scripted player: stand under the lowest cat and bark whenever possible
+    cats = state.cats
+    if not len(cats):
+        return Inputs(False, False, True)
+    # argmax picks the first of equally low cats, like a strict > scan would
+    target = cats.cats[int(np.argmax(cats.y[:cats.count]))]
+    cat_center = target.x + target.width / 2
+    dog_center = state.dog.x + 20
+    return Inputs(cat_center < dog_center - 3, cat_center > dog_center + 3, True)
+
+
+def simulate(settings, controller, max_frames, seed=None):
+    state = GameState(settings, seed=seed)
+    while state.frame < max_frames and not state.finished:
+        state.step(controller(state))
+    return state
@@ -0,0 +1,128 @@
+import gc
+import time
+
+# Play modes: "manual" turns automatic collection off and collects the young
+# generations at the end of a frame, "tuned" only raises the thresholds, "auto"
+# leaves Python's defaults alone (pauses are still measured)
+GC_MODES = ("manual", "tuned", "auto")
+TUNED_THRESHOLDS = (50000, 20, 100)
+# Manual mode: allocations since the last collection before a young collection runs,
+# and young collections before the middle generation is included
+MANUAL_YOUNG_LIMIT = 10000
+MANUAL_MIDDLE_EVERY = 10
+
+
+class GcPolicy:
+    def __init__(self, mode="manual"):
+        self.configure(mode)
+        self.playing = False
+        self.saved_thresholds = None
+        self.dirty = False
+        self.profiler = None
+        self.young_collections = 0
+        self.started = None
+        # (pauses, total ms, longest ms) per generation, split by whether a game was running
+        self.pauses = {True: [[0, 0.0, 0.0] for _ in range(3)], False: [[0, 0.0, 0.0] for _ in range(3)]}
+        self.collected = 0
+        self.frozen = 0
+        self.installed = False
+
+    def configure(self, mode):
+        if mode not in GC_MODES:
+            raise ValueError(f"unknown gc mode {mode!r}, expected one of {', '.join(GC_MODES)}")
+        self.mode = mode
+
+    def install(self):
+        if not self.installed:
+            gc.callbacks.append(self._callback)
+            self.installed = True
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+            return
+        if self.started is None:
+            return
+        pause_ms = (time.perf_counter() - self.started) * 1000
+        self.started = None
+        entry = self.pauses[self.playing][info["generation"]]
+        entry[0] += 1
+        entry[1] += pause_ms
+        entry[2] = max(entry[2], pause_ms)
+        self.collected += info["collected"]
+        profiler = self.profiler
+        if profiler is not None:
+            # Also counted inside whichever frame section the pause landed in
+            profiler.totals["gc"] = profiler.totals.get("gc", 0.0) + pause_ms / 1000
+
+    def enter_play(self, profiler=None):
+        # Everything alive now (assets, fonts, modules) is long-lived: collect once,
+        # then move it out of the tracked generations so no later pass rescans it
+        self.install()
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        self.playing = True
+        self.young_collections = 0
+        self.profiler = profiler if profiler is not None and profiler.enabled else None
+        if self.profiler is not None:
+            self.profiler.register(("gc",))
+        if self.mode == "manual":
+            gc.disable()
+        elif self.mode == "tuned":
+            self.saved_thresholds = gc.get_threshold()
+            gc.set_threshold(*TUNED_THRESHOLDS)
+
+    def set_profiler(self, profiler):
+        if self.playing and profiler.enabled:
+            profiler.register(("gc",))
+            self.profiler = profiler
+
+    def end_of_frame(self):
+        # Called after the frame is presented, while the loop would otherwise wait
+        if not self.playing or self.mode != "manual":
+            return
+        if gc.get_count()[0] < MANUAL_YOUNG_LIMIT:
+            return
+        self.young_collections += 1
+        gc.collect(1 if self.young_collections % MANUAL_MIDDLE_EVERY == 0 else 0)
+
+    def leave_play(self):
+        if not self.playing:
+            return
+        self.playing = False
+        self.profiler = None
+        if self.mode == "manual":
+            gc.enable()
+        elif self.saved_thresholds is not None:
+            gc.set_threshold(*self.saved_thresholds)
+            self.saved_thresholds = None
+        gc.unfreeze()
+        self.dirty = True
+
+    def collect(self):
+        # Full collection at a point where a pause cannot drop a frame
+        self.dirty = False
+        return gc.collect()
+
+    def collect_if_dirty(self):
+        if self.dirty:
+            self.collect()
+
+    def stats(self):
+        def summary(entries):
+            return {
+                f"gen{generation}": {"pauses": count, "total_ms": round(total, 2), "max_ms": round(longest, 2)}
+                for generation, (count, total, longest) in enumerate(entries) if count
+            }
+
+        return {
+            "mode": self.mode,
+            "in_play": summary(self.pauses[True]),
+            "outside_play": summary(self.pauses[False]),
+            "collected": self.collected,
+            "frozen": self.frozen,
+        }
+
+
+GC_POLICY = GcPolicy()
@@ -1,55 +1,122 @@
-import pygame
-import math
+from startup import STARTUP
 import random
-import time
-import json
-import os
 import sys
-import numpy as np
-from events import check_collisions, boss_exists, DogCollision
-from characters import Dog, Cat, Food, BossCat
+import threading
+import time
+import pygame
+STARTUP.mark("import pygame")
+from assets import ASSETS
+from settings import DEFAULT_SETTINGS, SETTING_OPTIONS
+from rendering import DISPLAY, TEXT_CACHE, DirtyRectRenderer, HudCounter, draw_entities
+from scores import ScoreStore
+from scheduler import Scheduler
+from gc_policy import GC_POLICY
+STARTUP.mark("import menu modules")
 
 HIGHSCORE_PATH = "highscore.json"
+LOGICAL_SIZE = (640, 480)
 GAME_OVER_DELAY_MS = 7000
-
-def load_highscore(path):
-    if not os.path.exists(path):
-        return 0
-    try:
-        with open(path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-            return int(data.get("highscore", 0))
-    except (OSError, ValueError, TypeError):
-        return 0
-
-def save_highscore(path, score):
-    try:
-        with open(path, "w", encoding="utf-8") as handle:
-            json.dump({"highscore": score}, handle)
-    except OSError:
-        pass
+DEFAULT_RENDER_FPS = 50
+MENU_IDLE_TIMEOUT_MS = 1000
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+MENU_BACKGROUND_PATH = "visuals/Start_Screen.jpg"
+BACKGROUND_PATH = 'visuals/Background_v2_640x480.png'
+START_SOUND_PATH = 'sounds/dog-howl-352680.mp3'
+GAME_OVER_SOUND_PATH = 'sounds/puppy_crying.mp3'
+
+def game_assets():
+    # Imported here so characters, game and events stay off the path to the title screen
+    from characters import Dog, Cat, Bark
+    from game import FOOD_IMAGE_PATH, FOOD_IMAGE_SCALE, FOOD_SOUND_PATH
+    images = [
+        (BACKGROUND_PATH,),
+        (FOOD_IMAGE_PATH, False, FOOD_IMAGE_SCALE),
+        (Dog.IMAGE_PATH, True),
+        (Cat.IMAGE_PATH, True),
+        (Cat.IMAGE_PATH, True, Cat.ENLARGE_SCALE),
+        # Mirrored variants drawn by the threaded renderer
+        (Dog.IMAGE_PATH, True, None, None, True),
+        (Cat.IMAGE_PATH, True, None, None, True),
+        (Cat.IMAGE_PATH, True, Cat.ENLARGE_SCALE, None, True),
+    ]
+    sounds = [Bark.SOUND_PATH, FOOD_SOUND_PATH, START_SOUND_PATH, GAME_OVER_SOUND_PATH]
+    # Sound path -> (channel group, voice cap)
+    channels = [
+        (Bark.SOUND_PATH, "barks", 3),
+        (FOOD_SOUND_PATH, "effects", 2),
+        (START_SOUND_PATH, "stingers", 1),
+        (GAME_OVER_SOUND_PATH, "stingers", 1),
+    ]
+    return images, sounds, channels
+
+def init_audio():
+    with STARTUP.stage("mixer init"):
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            print("No audio device, running silent")
+
+def warm_game_assets():
+    with STARTUP.stage("import game modules (background)"):
+        images, sounds, _ = game_assets()
+        # Pays for the simulation module imports before run_game needs them
+        import game, profiler, audio
+    with STARTUP.stage("decode game assets (background)"):
+        ASSETS.warm(images, sounds)
+
+def start_warmup():
+    # Runs once, after the title screen is on screen
+    if not STARTUP.mark_once("title screen shown"):
+        return
+    init_audio()
+    threading.Thread(target=warm_game_assets, name="asset-warmup", daemon=True).start()
 
 def draw_centered_text(screen, font, text, y, color):
-    text_surface = font.render(text, True, color)
+    text_surface = TEXT_CACHE.render(font, text, color)
     text_rect = text_surface.get_rect(center=(screen.get_width() // 2, y))
     screen.blit(text_surface, text_rect)
 
-def menu_loop(screen, font, title_font):
+def menu_events(timeout_ms=MENU_IDLE_TIMEOUT_MS):
+    # Sleep in SDL until input arrives instead of polling and redrawing at a fixed rate
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        # Nobody is waiting on an idle menu, so this is where a finished game's garbage goes
+        GC_POLICY.collect_if_dirty()
+        return []
+    return [event] + pygame.event.get()
+
+def menu_loop(screen, font, title_font, on_shown=None):
     options = ["Start Game", "Options", "Quit"]
     selected = 0
-    clock = pygame.time.Clock()
-    background = pygame.image.load("visuals/Start_Screen.jpg")
-    background = pygame.transform.scale(background, (screen.get_width(), screen.get_height()))
+    redraw = True
+    background = ASSETS.image(MENU_BACKGROUND_PATH, size=(screen.get_width(), screen.get_height()))
 
     while True:
-        for event in pygame.event.get():
+        if redraw:
+            screen.blit(background, (0, 0))
+            draw_centered_text(screen, title_font, "Morty & Rick: Cat Disaster", 120, (255, 255, 255))
+            for index, label in enumerate(options):
+                color = (255, 255, 0) if index == selected else (255, 255, 255)
+                draw_centered_text(screen, font, label, 220 + index * 40, color)
+            draw_centered_text(screen, font, "Use arrows or WASD, Enter to select", 420, (180, 180, 180))
+            DISPLAY.present()
+            redraw = False
+            if on_shown is not None:
+                on_shown()
+                on_shown = None
+
+        for event in menu_events():
             if event.type == pygame.QUIT:
                 return "quit"
+            if event.type in REDRAW_EVENTS:
+                redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_UP, pygame.K_w):
                     selected = (selected - 1) % len(options)
+                    redraw = True
                 elif event.key in (pygame.K_DOWN, pygame.K_s):
                     selected = (selected + 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_RETURN:
                     if options[selected] == "Start Game":
                         return "start"
@@ -57,45 +124,40 @@ def menu_loop(screen, font, title_font):
                         return "options"
                     return "quit"
 
-        screen.blit(background, (0, 0))
-        draw_centered_text(screen, title_font, "Morty & Rick: Cat Disaster", 120, (255, 255, 255))
-        for index, label in enumerate(options):
-            color = (255, 255, 0) if index == selected else (255, 255, 255)
-            draw_centered_text(screen, font, label, 220 + index * 40, color)
-        draw_centered_text(screen, font, "Use arrows or WASD, Enter to select", 420, (180, 180, 180))
-        pygame.display.flip()
-        clock.tick(30)
-
 def character_select_loop(screen, font, title_font):
     options = ["Morty"]
     selected = 0
-    clock = pygame.time.Clock()
-    background = pygame.image.load("visuals/Start_Screen.jpg")
-    background = pygame.transform.scale(background, (screen.get_width(), screen.get_height()))
+    redraw = True
+    background = ASSETS.image(MENU_BACKGROUND_PATH, size=(screen.get_width(), screen.get_height()))
 
     while True:
-        for event in pygame.event.get():
+        if redraw:
+            screen.blit(background, (0, 0))
+            draw_centered_text(screen, title_font, "Choose Your Character", 120, (255, 255, 255))
+            for index, label in enumerate(options):
+                color = (255, 255, 0) if index == selected else (255, 255, 255)
+                draw_centered_text(screen, font, label, 220 + index * 40, color)
+            draw_centered_text(screen, font, "Enter to start, Esc to go back", 420, (180, 180, 180))
+            DISPLAY.present()
+            redraw = False
+
+        for event in menu_events():
             if event.type == pygame.QUIT:
                 return "quit"
+            if event.type in REDRAW_EVENTS:
+                redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_UP, pygame.K_w):
                     selected = (selected - 1) % len(options)
+                    redraw = True
                 elif event.key in (pygame.K_DOWN, pygame.K_s):
                     selected = (selected + 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_RETURN:
                     return options[selected]
                 elif event.key == pygame.K_ESCAPE:
                     return None
 
-        screen.blit(background, (0, 0))
-        draw_centered_text(screen, title_font, "Choose Your Character", 120, (255, 255, 255))
-        for index, label in enumerate(options):
-            color = (255, 255, 0) if index == selected else (255, 255, 255)
-            draw_centered_text(screen, font, label, 220 + index * 40, color)
-        draw_centered_text(screen, font, "Enter to start, Esc to go back", 420, (180, 180, 180))
-        pygame.display.flip()
-        clock.tick(30)
-
 def format_setting_value(value):
     if isinstance(value, float):
         if value.is_integer():
@@ -107,33 +169,38 @@ def clamp(value, min_value, max_value):
     return max(min_value, min(value, max_value))
 
 def options_loop(screen, font, title_font, settings):
-    options = [
-        ("Cat spawn interval", "CAT_SPAWN_INTERVAL", 10, 10, 400),
-        ("Cats before boss", "CATS_BEFORE_BOSS", 1, 1, 200),
-        ("Dog speed", "DOG_SPEED", 1, 1, 20),
-        ("Initial cat speed", "GLOBAL_CAT_SPEED", 0.5, 0.5, 10),
-        ("Max cat speed", "MAX_CAT_SPEED", 0.5, 1, 20),
-        ("Boss cat speed", "BOSS_CAT_SPEED", 0.5, 1, 20),
-        ("Boss cat health", "BOSS_CAT_HEALTH", 1, 1, 100),
-        ("Bark speed", "BARK_SPEED", 1, 5, 100),
-        ("Food levels before dog", "FOOD_LEVELS_BEFORE_DOG", 1, 1, 10),
-        ("Food X offset", "FOOD_X_OFFSET", 10, -200, 200),
-        ("Food X base", "FOOD_X_BASE", 10, 0, 640),
-        ("Speed increase interval", "SPEED_INCREASE_INTERVAL", 500, 1000, 60000),
-        ("Back", None, 0, 0, 0),
-    ]
+    options = SETTING_OPTIONS + [("Back", None, 0, 0, 0)]
     selected = 0
-    clock = pygame.time.Clock()
+    redraw = True
 
     while True:
-        for event in pygame.event.get():
+        if redraw:
+            screen.fill((0, 0, 0))
+            draw_centered_text(screen, title_font, "Options", 80, (255, 255, 255))
+            start_y = 140
+            for index, (label, key, _, _, _) in enumerate(options):
+                color = (255, 255, 0) if index == selected else (255, 255, 255)
+                if key is None:
+                    draw_centered_text(screen, font, label, start_y + index * 28, color)
+                else:
+                    value = format_setting_value(settings[key])
+                    draw_centered_text(screen, font, f"{label}: {value}", start_y + index * 28, color)
+            draw_centered_text(screen, font, "Left/Right to adjust, Enter/Esc to go back", 440, (180, 180, 180))
+            DISPLAY.present()
+            redraw = False
+
+        for event in menu_events():
             if event.type == pygame.QUIT:
                 return "quit"
+            if event.type in REDRAW_EVENTS:
+                redraw = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_UP, pygame.K_w):
                     selected = (selected - 1) % len(options)
+                    redraw = True
                 elif event.key in (pygame.K_DOWN, pygame.K_s):
                     selected = (selected + 1) % len(options)
+                    redraw = True
                 elif event.key in (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d):
                     label, key, step, min_value, max_value = options[selected]
                     if key is not None:
@@ -144,198 +211,279 @@ def options_loop(screen, font, title_font, settings):
                             settings["MAX_CAT_SPEED"] = settings[key]
                         if key == "MAX_CAT_SPEED" and settings[key] < settings["GLOBAL_CAT_SPEED"]:
                             settings["GLOBAL_CAT_SPEED"] = settings[key]
+                        redraw = True
                 elif event.key == pygame.K_RETURN:
                     if options[selected][1] is None:
                         return "back"
                 elif event.key == pygame.K_ESCAPE:
                     return "back"
 
-        screen.fill((0, 0, 0))
-        draw_centered_text(screen, title_font, "Options", 80, (255, 255, 255))
-        start_y = 140
-        for index, (label, key, _, _, _) in enumerate(options):
-            color = (255, 255, 0) if index == selected else (255, 255, 255)
-            if key is None:
-                draw_centered_text(screen, font, label, start_y + index * 28, color)
-            else:
-                value = format_setting_value(settings[key])
-                draw_centered_text(screen, font, f"{label}: {value}", start_y + index * 28, color)
-        draw_centered_text(screen, font, "Left/Right to adjust, Enter/Esc to go back", 440, (180, 180, 180))
-        pygame.display.flip()
-        clock.tick(30)
-
-def run_game(screen, settings, highscore, character):
+def run_game(screen, settings, scores, character, dirty_rects=False, render_fps=DEFAULT_RENDER_FPS, profile=False, profile_csv=None, startup_report=False, threaded=False, seed=None, record=None, replay=None, endless=False, max_cats=None):
+    with STARTUP.stage("import game modules"):
+        from game import ENDLESS_MAX_CATS, NO_INPUT, EndlessState, FixedTimestep, GameState, Inputs
+        from profiler import NULL_PROFILER, EntityLoadReport, FrameProfiler
+        from audio import create_audio
+        from replay import InputRecorder, describe
+        if threaded:
+            from snapshots import SimulationThread, draw_snapshot
     screen_width = screen.get_width()
     screen_height = screen.get_height()
-    background_image = pygame.image.load('visuals/Background_v2_640x480.png')
+    game_images, game_sounds, sound_channels = game_assets()
+    with STARTUP.stage("game asset preload"):
+        ASSETS.preload(game_images, game_sounds)
+    background_image = ASSETS.image(BACKGROUND_PATH)
     font = pygame.font.Font(None, 24)
     game_over_font = pygame.font.Font(None, 48)
-    game_over_sound = pygame.mixer.Sound('sounds/puppy_crying.mp3')
-
-    CAT_SPAWN_INTERVAL = int(settings["CAT_SPAWN_INTERVAL"])
-    CAT_TIMER = 20
-    CATS_BEFORE_BOSS = int(settings["CATS_BEFORE_BOSS"])
-    DOG_SPEED = settings["DOG_SPEED"]
-    GLOBAL_CAT_SPEED = settings["GLOBAL_CAT_SPEED"]
-    MAX_CAT_SPEED = settings["MAX_CAT_SPEED"]
-    BOSS_CAT_SPEED = settings["BOSS_CAT_SPEED"]
-    BOSS_CAT_HEALTH = int(settings["BOSS_CAT_HEALTH"])
-    BARK_SPEED = settings["BARK_SPEED"]
-    FOOD_LEVELS_BEFORE_DOG = int(settings["FOOD_LEVELS_BEFORE_DOG"])
-    FOOD_X_OFFSET = int(settings["FOOD_X_OFFSET"])
-    FOOD_X_BASE = int(settings["FOOD_X_BASE"])
-    SPEED_INCREASE_INTERVAL = int(settings["SPEED_INCREASE_INTERVAL"])
-
-    dog = Dog(screen_width // 2, 400, DOG_SPEED, (255, 0, 0), BARK_SPEED)
-    cats = []
-    food = Food(
-        FOOD_X_BASE + FOOD_X_OFFSET,
-        dog.y - (FOOD_LEVELS_BEFORE_DOG * Cat.VERTICAL_MOVE),
-        image_path="visuals/8853301006071_compressed copy.jpg",
-        sound_path="sounds/smw_power-up_appears.wav",
-        scale=0.1,
-    )
-    food.x -= food.width // 2
-    start_sound = pygame.mixer.Sound('sounds/dog-howl-352680.mp3')
-
+    score_counter = HudCounter(font, "Cats Destroyed: ", (255, 255, 255))
+    highscore_counter = HudCounter(font, "Highscore: ", (255, 255, 255))
+    cat_counter = HudCounter(font, "Cats: ", (255, 255, 255))
+
+    if replay is not None:
+        settings = replay.settings
+        seed = replay.seed
+        state = replay.new_state()
+    else:
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        if endless:
+            state = EndlessState(settings, screen_width, seed=seed, screen_height=screen_height, max_cats=max_cats or ENDLESS_MAX_CATS)
+        else:
+            state = GameState(settings, screen_width, seed=seed, screen_height=screen_height)
+    endless = isinstance(state, EndlessState)
+    recorder = None
+    if record:
+        recorder = state.recorder = InputRecorder(
+            seed, settings, (screen_width, screen_height), state.max_cats if endless else None
+        )
+    controller = None if replay is None else replay.controller
+    audio = create_audio()
+    audio.register_all(sound_channels)
+    preload_misses = ASSETS.misses
+    if STARTUP.mark_once("first game frame") and startup_report:
+        print(STARTUP.report())
+    renderer = DirtyRectRenderer(screen, background_image) if dirty_rects else None
+    # The profiler is not thread-safe, so a threaded run only times the render thread
+    simulation_sections = [] if threaded else [name for name, _ in state.phases]
+    profile_sections = ["events"] + simulation_sections + ["render", "present"]
+    profiler = NULL_PROFILER
+    if profile or profile_csv:
+        profiler = FrameProfiler(csv_path=profile_csv, sections=profile_sections)
+    if not threaded:
+        state.profiler = profiler
+    show_profile = profiler.enabled
+    # Endless runs report frame work time (clock.tick excluded) against the live cat count
+    load_report = EntityLoadReport() if endless else None
+
+    # Assets and fonts are loaded: freeze them and take the collector off the frame path
+    GC_POLICY.enter_play(profiler)
     clock = pygame.time.Clock()
-    last_speed_increase_time = pygame.time.get_ticks()
-    start_sound.play()
-    game_over = False
-    game_over_start = None
+    timestep = FixedTimestep()
+    audio.play(START_SOUND_PATH)
     game_over_sound_played = False
+    # Screen transitions, keyed on simulation time so they pause with the game
+    transitions = Scheduler()
+    simulation = SimulationThread(state, controller=controller).start() if threaded else None
+    view = state if simulation is None else simulation.consume()
 
     RUNNING = True
     quitting = False
     while RUNNING:
-        current_time = pygame.time.get_ticks()
-        if not game_over:
-            if current_time - last_speed_increase_time > SPEED_INCREASE_INTERVAL:
-                if GLOBAL_CAT_SPEED < MAX_CAT_SPEED:
-                    GLOBAL_CAT_SPEED += math.log(GLOBAL_CAT_SPEED + 1)
-                last_speed_increase_time = current_time
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                RUNNING = False
-                quitting = True
-
-        if not game_over:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                dog.move(-1, 0)
-                dog.position = 'left'
-            if keys[pygame.K_RIGHT]:
-                dog.move(1, 0)
-                dog.position = 'right'
-            if keys[pygame.K_SPACE]:
-                dog.bark()
-
-        if not game_over:
-            dog.update_barks()
-            cats = check_collisions(dog, cats)
-
-        if dog.destroyed_boss:
+        work_started = time.perf_counter()
+        profiler.begin_frame()
+        with profiler.section("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    RUNNING = False
+                    quitting = True
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    # F3 toggles the timing overlay, starting the profiler on first use
+                    if not profiler.enabled:
+                        profiler = FrameProfiler(sections=profile_sections)
+                        if not threaded:
+                            state.profiler = profiler
+                        GC_POLICY.set_profiler(profiler)
+                    show_profile = not show_profile
+
+            inputs = NO_INPUT
+            if not view.finished:
+                keys = pygame.key.get_pressed()
+                inputs = Inputs(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_SPACE])
+        if simulation is None:
+            for _ in range(timestep.advance(clock.get_time())):
+                state.step(inputs if controller is None else controller(state))
+                for path in state.sounds:
+                    audio.play(path)
+            alpha = timestep.alpha
+            cats_destroyed = state.dog.cats_destroyed
+        else:
+            simulation.inputs = inputs
+            for path in simulation.new_sounds():
+                audio.play(path)
+            view = simulation.consume()
+            alpha = simulation.alpha(view)
+            cats_destroyed = view.cats_destroyed
+        game_over = view.game_over
+
+        if view.won:
             print("Dog Wins")
-            if dog.cats_destroyed > highscore:
-                highscore = dog.cats_destroyed
-                save_highscore(HIGHSCORE_PATH, highscore)
+            if replay is None:
+                scores.record(cats_destroyed, settings, won=True)
             RUNNING = False
 
-        if not game_over:
-            for cat in cats:
-                cat.descend(GLOBAL_CAT_SPEED, screen_width, screen_height)
-
-        if not game_over:
-            if dog.cats_destroyed == CATS_BEFORE_BOSS and not boss_exists(cats):
-                boss = BossCat(10, 140, (200, 100, 50), BOSS_CAT_SPEED, BOSS_CAT_HEALTH)
-                cats.append(boss)
+        if game_over and not game_over_sound_played:
+            print('Dog Dies')
+            audio.play(GAME_OVER_SOUND_PATH)
+            game_over_sound_played = True
+            if replay is None:
+                scores.record(cats_destroyed, settings)
+            # Nothing moves during the game-over delay, so a full pause costs nothing here
+            GC_POLICY.collect()
+            transitions.at(view.game_over_time + GAME_OVER_DELAY_MS, "leave_game")
+
+        if transitions.pop(view.time_ms) == "leave_game":
+            RUNNING = False
+        if replay is not None and view.frame >= len(replay):
+            RUNNING = False
 
-        if not game_over:
-            if CAT_TIMER <= 0 and not boss_exists(cats):
-                cats.append(Cat(int(random.uniform(40, screen_width - 20)), 40, (0, 0, 255), GLOBAL_CAT_SPEED))
-                CAT_TIMER = CAT_SPAWN_INTERVAL + np.random.normal(0, 60)
+        with profiler.section("render"):
+            if renderer is None:
+                screen.fill((0, 0, 0))
+                screen.blit(background_image, (0, 0))
             else:
-                CAT_TIMER -= 1
-
-        if not game_over:
-            for cat in cats:
-                cat.check_food(food)
-                if DogCollision.collides(cat, dog):
-                    print('Dog Dies')
-                    game_over = True
-                    game_over_start = current_time
-                    if not game_over_sound_played:
-                        game_over_sound.play()
-                        game_over_sound_played = True
-                    if dog.cats_destroyed > highscore:
-                        highscore = dog.cats_destroyed
-                        save_highscore(HIGHSCORE_PATH, highscore)
-                    break
-
-        if game_over and game_over_start is not None:
-            if current_time - game_over_start >= GAME_OVER_DELAY_MS:
-                RUNNING = False
-
-        screen.fill((0, 0, 0))
-        screen.blit(background_image, (0, 0))
-        food.draw(screen)
-        for cat in cats:
-            cat.draw(screen)
-        dog.draw_img(screen)
-        score_text = font.render(f"Cats Destroyed: {dog.cats_destroyed}", True, (255, 255, 255))
-        highscore_text = font.render(f"Highscore: {highscore}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 10))
-        screen.blit(highscore_text, (10, 30))
-        if game_over:
-            game_over_text = game_over_font.render("Game Over", True, (255, 0, 0))
-            text_rect = game_over_text.get_rect(center=(screen_width // 2, screen_height // 2))
-            screen.blit(game_over_text, text_rect)
-
-        pygame.display.flip()
-        clock.tick(50)
-
-    return highscore, quitting
+                renderer.restore_background()
+            if simulation is None:
+                entity_rects = draw_entities(screen, state, alpha)
+            else:
+                entity_rects = draw_snapshot(screen, view, alpha)
+            score_rect = score_counter.draw(screen, cats_destroyed, (10, 10))
+            highscore_rect = highscore_counter.draw(screen, scores.highscore, (10, 30))
+            hud_rects = [score_rect, highscore_rect]
+            if endless:
+                live_cats = len(state.cats) if simulation is None else len(view.cats.x)
+                hud_rects.append(cat_counter.draw(screen, live_cats, (screen_width - 110, 10)))
+            if show_profile:
+                for index, line in enumerate(profiler.overlay_lines()):
+                    hud_rects.append(screen.blit(font.render(line, True, (255, 255, 0)), (10, 50 + index * 18)))
+            if game_over:
+                game_over_text = TEXT_CACHE.render(game_over_font, "Game Over", (255, 0, 0))
+                text_rect = game_over_text.get_rect(center=(screen_width // 2, screen_height // 2))
+                screen.blit(game_over_text, text_rect)
+                hud_rects.append(text_rect)
+
+        with profiler.section("present"):
+            if renderer is None:
+                DISPLAY.present()
+            else:
+                for rect in entity_rects:
+                    renderer.mark(rect)
+                for rect in hud_rects:
+                    renderer.mark(rect)
+                renderer.present()
+        if load_report is not None:
+            load_report.record(live_cats, (time.perf_counter() - work_started) * 1000)
+        GC_POLICY.end_of_frame()
+        clock.tick(render_fps)
+
+    if simulation is not None:
+        simulation.stop()
+        print(f"Snapshots: {simulation.stats()}")
+    profiler.close()
+    GC_POLICY.leave_play()
+    if recorder is not None:
+        recorder.save(record)
+        print(f"Recorded {len(recorder)} ticks to {record}")
+    print(describe(state, seed))
+    if load_report is not None:
+        print("Frame work time by live cats:")
+        for line in load_report.lines():
+            print(line)
+    if ASSETS.misses != preload_misses:
+        print(f"Assets loaded mid-game: {ASSETS.misses - preload_misses}")
+    print(f"Asset cache: {ASSETS.stats()}")
+    print(f"Audio: {audio.stats()}")
+    # Don't let the howl or the game-over stinger play on over the menu
+    audio.stop()
+    print(f"GC: {GC_POLICY.stats()}")
+    return quitting
+
+def flag_value(args, name, default=None):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+def parse_size(text):
+    if text is None:
+        return None
+    width, _, height = text.lower().partition("x")
+    return (int(width), int(height))
 
 def main(args=None):
     if args is None:
         args = sys.argv[1:]
-    game_only = "--game_only" in args
-
-    pygame.init()
-    pygame.mixer.init()
-    SCREEN_WIDTH = 640
-    SCREEN_HEIGHT = 480
-
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption('Morty & Rick: Cat Disaster')
-
-    font = pygame.font.Font(None, 24)
-    title_font = pygame.font.Font(None, 48)
-
-    settings = {
-        "CAT_SPAWN_INTERVAL": 100,
-        "CATS_BEFORE_BOSS": 40,
-        "DOG_SPEED": 7,
-        "GLOBAL_CAT_SPEED": 2.0,
-        "MAX_CAT_SPEED": 7.5,
-        "BOSS_CAT_SPEED": 5.0,
-        "BOSS_CAT_HEALTH": 20,
-        "BARK_SPEED": 45,
-        "FOOD_LEVELS_BEFORE_DOG": 4,
-        "FOOD_X_OFFSET": -20,
-        "FOOD_X_BASE": 200,
-        "SPEED_INCREASE_INTERVAL": 10000,
+    replay_path = flag_value(args, "--replay")
+    if replay_path and "--headless" in args:
+        from replay import Recording, describe, play
+        recording = Recording.load(replay_path)
+        state, elapsed = play(recording)
+        print(describe(state, recording.seed))
+        print(f"Replayed {state.frame} ticks in {elapsed:.2f}s ({state.frame / elapsed:.0f} ticks/s)")
+        return
+    # A replay skips the menus and exits when the recording runs out
+    game_only = "--game_only" in args or replay_path is not None
+    GC_POLICY.configure(flag_value(args, "--gc", "manual"))
+    game_options = {
+        "dirty_rects": "--dirty_rects" in args,
+        "render_fps": int(flag_value(args, "--fps", DEFAULT_RENDER_FPS)),
+        "profile": "--profile" in args,
+        "profile_csv": flag_value(args, "--profile_csv"),
+        "startup_report": "--startup_report" in args,
+        "threaded": "--threaded" in args,
+        "seed": int(flag_value(args, "--seed")) if "--seed" in args else None,
+        "record": flag_value(args, "--record"),
+        "endless": "--endless" in args,
+        "max_cats": int(flag_value(args, "--max_cats")) if "--max_cats" in args else None,
     }
-    highscore = load_highscore(HIGHSCORE_PATH)
+    if replay_path:
+        from replay import Recording
+        game_options["replay"] = Recording.load(replay_path)
+
+    # Only the subsystems the title screen needs; audio comes up once it is visible
+    with STARTUP.stage("display init"):
+        pygame.display.init()
+        pygame.font.init()
+    SCREEN_WIDTH, SCREEN_HEIGHT = LOGICAL_SIZE
+
+    with STARTUP.stage("window"):
+        # Everything draws at SCREEN_WIDTH x SCREEN_HEIGHT; --window/--fullscreen only change the output size
+        screen = DISPLAY.open(
+            (SCREEN_WIDTH, SCREEN_HEIGHT),
+            parse_size(flag_value(args, "--window")),
+            fullscreen="--fullscreen" in args,
+            smooth=flag_value(args, "--scale", "integer") == "smooth",
+        )
+        pygame.display.set_caption('Morty & Rick: Cat Disaster')
+
+    # Pre-decoded assets from build_assets.py; without the pack everything loads from the loose files
+    with STARTUP.stage("asset pack"):
+        ASSETS.open_pack()
+
+    with STARTUP.stage("fonts"):
+        font = pygame.font.Font(None, 24)
+        title_font = pygame.font.Font(None, 48)
+
+    settings = dict(DEFAULT_SETTINGS)
+    scores = ScoreStore(HIGHSCORE_PATH)
 
     RUNNING = True
     if game_only:
-        _, quitting = run_game(screen, settings, highscore, "Morty")
+        init_audio()
+        quitting = run_game(screen, settings, scores, "Morty", **game_options)
         if quitting:
             RUNNING = False
     while RUNNING and not game_only:
-        choice = menu_loop(screen, font, title_font)
+        choice = menu_loop(screen, font, title_font, on_shown=start_warmup)
         if choice == "start":
             character = character_select_loop(screen, font, title_font)
             if character == "quit":
@@ -343,7 +491,7 @@ def main(args=None):
                 continue
             if character is None:
                 continue
-            highscore, quitting = run_game(screen, settings, highscore, character)
+            quitting = run_game(screen, settings, scores, character, **game_options)
             if quitting:
                 RUNNING = False
         elif choice == "options":
@@ -352,6 +500,9 @@ def main(args=None):
         else:
             RUNNING = False
 
+    if game_options["startup_report"] and "first game frame" not in STARTUP.marked:
+        print(STARTUP.report())
+    scores.close()
     pygame.quit()
 
 if __name__ == "__main__":
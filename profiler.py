@@ -0,0 +1,175 @@
+import csv
+import time
+from collections import deque
+
+PERCENTILES = (50, 95, 99)
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        totals = self.profiler.totals
+        totals[self.name] = totals.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, window=300, csv_path=None, sections=()):
+        self.frame_times = deque(maxlen=window)
+        self.section_times = {}
+        self.totals = {}
+        self.sections = {}
+        self.names = []
+        self.frame = 0
+        self.frame_started = None
+        self.csv_file = None
+        self.csv_writer = None
+        self.register(sections)
+        if csv_path:
+            self.csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self.csv_writer = csv.writer(self.csv_file)
+
+    def register(self, names):
+        for name in names:
+            if name not in self.sections:
+                self.sections[name] = _Section(self, name)
+                self.names.append(name)
+
+    def section(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            self.register((name,))
+            section = self.sections[name]
+        return section
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self.frame_started is not None:
+            self._finish_frame((now - self.frame_started) * 1000)
+        self.frame_started = now
+
+    def _finish_frame(self, frame_ms):
+        self.frame += 1
+        self.frame_times.append(frame_ms)
+        totals = self.totals
+        for name in self.names:
+            samples = self.section_times.get(name)
+            if samples is None:
+                samples = self.section_times[name] = deque(maxlen=self.frame_times.maxlen)
+            samples.append(totals.get(name, 0.0) * 1000)
+        if self.csv_writer is not None:
+            if self.frame == 1:
+                self.csv_writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in self.names])
+            self.csv_writer.writerow(
+                [self.frame, f"{frame_ms:.3f}"] + [f"{totals.get(name, 0.0) * 1000:.3f}" for name in self.names]
+            )
+        totals.clear()
+
+    def percentiles(self, samples=None):
+        ordered = sorted(self.frame_times if samples is None else samples)
+        if not ordered:
+            return {percentile: 0.0 for percentile in PERCENTILES}
+        last = len(ordered) - 1
+        return {percentile: ordered[min(last, round(last * percentile / 100))] for percentile in PERCENTILES}
+
+    def overlay_lines(self):
+        frame = self.percentiles()
+        lines = [f"frame ms p50 {frame[50]:.1f}  p95 {frame[95]:.1f}  p99 {frame[99]:.1f}"]
+        for name in self.names:
+            samples = self.section_times.get(name)
+            if samples:
+                lines.append(f"{name}: {sum(samples) / len(samples):.2f} ms")
+        return lines
+
+    def close(self):
+        if self.frame_started is not None:
+            self._finish_frame((time.perf_counter() - self.frame_started) * 1000)
+            self.frame_started = None
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+
+class EntityLoadReport:
+    # Frame work time bucketed by how many entities were live, to find where a
+    # growing scene stops fitting in the frame budget
+    def __init__(self, bucket_size=100, budget_ms=20.0):
+        self.bucket_size = bucket_size
+        self.budget_ms = budget_ms
+        self.buckets = {}
+        self.peak = 0
+
+    def record(self, entities, frame_ms):
+        self.peak = max(self.peak, entities)
+        samples = self.buckets.get(entities // self.bucket_size)
+        if samples is None:
+            samples = self.buckets[entities // self.bucket_size] = []
+        samples.append(frame_ms)
+
+    def p95(self, bucket):
+        samples = sorted(self.buckets[bucket])
+        return samples[min(len(samples) - 1, round((len(samples) - 1) * 0.95))]
+
+    def first_over_budget(self):
+        # Lowest bucket whose p95 frame time misses the budget
+        for bucket in sorted(self.buckets):
+            if self.p95(bucket) > self.budget_ms:
+                return bucket * self.bucket_size
+        return None
+
+    def lines(self):
+        lines = [f"{'entities':>11} {'frames':>7} {'mean ms':>8} {'p95 ms':>7}"]
+        for bucket in sorted(self.buckets):
+            samples = self.buckets[bucket]
+            low = bucket * self.bucket_size
+            lines.append(
+                f"{low:>5}-{low + self.bucket_size - 1:<5} {len(samples):>7} {sum(samples) / len(samples):>8.2f} {self.p95(bucket):>7.2f}"
+            )
+        over = self.first_over_budget()
+        if over is None:
+            lines.append(f"Peak {self.peak} entities, p95 stayed within the {self.budget_ms:.0f} ms budget")
+        else:
+            lines.append(f"Peak {self.peak} entities, p95 first over the {self.budget_ms:.0f} ms budget at {over} entities")
+        return lines
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    enabled = False
+    _section = _NullSection()
+
+    def register(self, names):
+        pass
+
+    def section(self, name):
+        return self._section
+
+    def begin_frame(self):
+        pass
+
+    def overlay_lines(self):
+        return []
+
+    def close(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,186 @@
+import pygame
+from collections import OrderedDict
+
+
+class SpriteBatch:
+    # Collects (surface, position) pairs and hands them to SDL in one Surface.blits call
+    def __init__(self):
+        self.items = []
+
+    def add(self, surface, position):
+        self.items.append((surface, position))
+
+    def extend(self, items):
+        self.items.extend(items)
+
+    def flush(self, screen, rects=False):
+        drawn = screen.blits(self.items, rects)
+        self.items.clear()
+        return drawn
+
+
+_batch = SpriteBatch()
+
+
+def draw_entities(screen, state, alpha=1.0, batch=None):
+    # Returns the screen rects that were drawn, for the dirty-rect renderer
+    if batch is None:
+        batch = _batch
+    food_rects = []
+    for food in state.foods:
+        if food.image:
+            batch.add(food.image, (food.x, food.y))
+        else:
+            food.draw(screen)
+            food_rects.append(food.rect())
+    batch.extend(state.cats.sprites(alpha))
+    dog = state.dog
+    batch.add(dog.sprite(), dog.render_position(alpha))
+    return food_rects + batch.flush(screen, rects=True)
+
+
+class Display:
+    # The game always draws into a fixed logical-size surface; when the window is a
+    # different size that surface is scaled onto it once per presented frame
+    def __init__(self):
+        self.window = None
+        self.surface = None
+        self.scaled = False
+        self.smooth = False
+        self.target = None
+        self.factor = 1.0
+
+    def open(self, logical_size, window_size=None, fullscreen=False, smooth=False):
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if window_size is None:
+            window_size = (0, 0) if fullscreen else logical_size
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.smooth = smooth
+        window_width, window_height = self.window.get_size()
+        logical_width, logical_height = logical_size
+        self.scaled = (window_width, window_height) != (logical_width, logical_height)
+        if not self.scaled:
+            self.surface = self.window
+            self.target = self.window.get_rect()
+            self.factor = 1.0
+            return self.surface
+        self.surface = pygame.Surface(logical_size).convert()
+        factor = min(window_width / logical_width, window_height / logical_height)
+        if not smooth and factor >= 1:
+            # Whole-pixel scaling keeps sprites crisp; the rest of the window is letterboxed
+            factor = int(factor)
+        self.factor = factor
+        self.target = pygame.Rect(0, 0, int(logical_width * factor), int(logical_height * factor))
+        self.target.center = self.window.get_rect().center
+        self.window.fill((0, 0, 0))
+        self.present()
+        return self.surface
+
+    def present(self, rects=None):
+        if self.scaled:
+            destination = self.window.subsurface(self.target)
+            if self.smooth:
+                pygame.transform.smoothscale(self.surface, self.target.size, destination)
+            else:
+                pygame.transform.scale(self.surface, self.target.size, destination)
+            if rects is not None:
+                factor = self.factor
+                left, top = self.target.topleft
+                rects = [
+                    pygame.Rect(
+                        left + int(rect.x * factor), top + int(rect.y * factor),
+                        int(rect.width * factor) + 2, int(rect.height * factor) + 2,
+                    )
+                    for rect in rects
+                ]
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+DISPLAY = Display()
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, background, display=DISPLAY):
+        self.screen = screen
+        self.display = display
+        self.background = background
+        self.screen_rect = screen.get_rect()
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_update = True
+
+    def restore_background(self):
+        if self.full_update:
+            self.screen.blit(self.background, (0, 0))
+            return
+        for rect in self.previous_rects:
+            self.screen.blit(self.background, rect, rect)
+
+    def mark(self, rect):
+        # Pad by a pixel on each side to cover float positions truncated by blit
+        rect = pygame.Rect(rect).inflate(2, 2).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current_rects.append(rect)
+
+    def present(self):
+        if self.full_update:
+            self.display.present()
+            self.full_update = False
+        else:
+            self.display.present(self.previous_rects + self.current_rects)
+        self.previous_rects = self.current_rects
+        self.current_rects = []
+
+
+class TextCache:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+TEXT_CACHE = TextCache()
+
+
+class NumberAtlas:
+    GLYPHS = "-0123456789"
+
+    def __init__(self, font, color, antialias=True):
+        self.glyphs = {glyph: font.render(glyph, antialias, color) for glyph in NumberAtlas.GLYPHS}
+        self.height = max(surface.get_height() for surface in self.glyphs.values())
+
+    def draw(self, screen, value, position):
+        x, y = position
+        for glyph in str(value):
+            surface = self.glyphs[glyph]
+            screen.blit(surface, (x, y))
+            x += surface.get_width()
+        return pygame.Rect(position[0], y, x - position[0], self.height)
+
+
+class HudCounter:
+    def __init__(self, font, label, color, cache=TEXT_CACHE):
+        self.label = cache.render(font, label, color)
+        self.digits = NumberAtlas(font, color)
+
+    def draw(self, screen, value, position):
+        label_rect = screen.blit(self.label, position)
+        return label_rect.union(self.digits.draw(screen, value, label_rect.topright))
@@ -0,0 +1,97 @@
+import json
+import struct
+import time
+import zlib
+
+from game import EndlessState, GameState, Inputs
+
+MAGIC = b"CDRP"
+VERSION = 1
+# Magic, format version, length of the JSON header that follows
+PREAMBLE = struct.Struct("<4sBI")
+LEFT_BIT = 1
+RIGHT_BIT = 2
+BARK_BIT = 4
+# Every possible key state, indexed by its packed byte
+DECODED = [Inputs(bool(code & LEFT_BIT), bool(code & RIGHT_BIT), bool(code & BARK_BIT)) for code in range(8)]
+
+
+class InputRecorder:
+    # One byte of key state per simulation tick, zlib-compressed on save
+    def __init__(self, seed, settings, screen_size, max_cats=None):
+        self.header = {"seed": seed, "settings": dict(settings), "screen_size": list(screen_size)}
+        if max_cats is not None:
+            self.header["endless_max_cats"] = max_cats
+        self.frames = bytearray()
+
+    def record(self, inputs):
+        self.frames.append(
+            (LEFT_BIT if inputs.left else 0) | (RIGHT_BIT if inputs.right else 0) | (BARK_BIT if inputs.bark else 0)
+        )
+
+    def __len__(self):
+        return len(self.frames)
+
+    def save(self, path):
+        header = json.dumps(self.header).encode("utf-8")
+        with open(path, "wb") as handle:
+            handle.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            handle.write(header)
+            handle.write(zlib.compress(bytes(self.frames), 9))
+
+
+class Recording:
+    def __init__(self, seed, settings, screen_size, frames, max_cats=None):
+        self.seed = seed
+        self.settings = settings
+        self.screen_size = tuple(screen_size)
+        self.frames = frames
+        # Set for endless-mode sessions, which replay into an EndlessState
+        self.max_cats = max_cats
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as handle:
+            data = handle.read()
+        magic, version, header_length = PREAMBLE.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        start = PREAMBLE.size
+        header = json.loads(data[start:start + header_length].decode("utf-8"))
+        frames = zlib.decompress(data[start + header_length:])
+        return cls(header["seed"], header["settings"], header["screen_size"], frames, header.get("endless_max_cats"))
+
+    def __len__(self):
+        return len(self.frames)
+
+    def new_state(self):
+        width, height = self.screen_size
+        if self.max_cats is not None:
+            return EndlessState(self.settings, width, seed=self.seed, screen_height=height, max_cats=self.max_cats)
+        return GameState(self.settings, width, seed=self.seed, screen_height=height)
+
+    def controller(self, state):
+        # state.frame is the number of ticks already run, so it indexes the next one
+        if state.frame < len(self.frames):
+            return DECODED[self.frames[state.frame]]
+        return DECODED[0]
+
+
+def play(recording):
+    # Headless, uncapped playback of a whole recording
+    state = recording.new_state()
+    controller = recording.controller
+    ticks = len(recording)
+    started = time.perf_counter()
+    while state.frame < ticks:
+        state.step(controller(state))
+    return state, time.perf_counter() - started
+
+
+def describe(state, seed):
+    outcome = "won" if state.won else "died" if state.game_over else "quit"
+    line = f"Session: seed {seed}, {state.frame} ticks, {state.dog.cats_destroyed} cats destroyed, {outcome}"
+    if isinstance(state, EndlessState):
+        line += (f"; endless wave {state.wave}, {state.bosses_destroyed} bosses destroyed, "
+                 f"{state.culled} cats culled, {state.capped} spawns capped at {state.max_cats}")
+    return line
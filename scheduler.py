@@ -0,0 +1,29 @@
+import heapq
+import itertools
+
+
+class Scheduler:
+    # Min-heap of (due, priority, sequence, name); equal due times run in priority order,
+    # then in the order they were scheduled
+    def __init__(self):
+        self.queue = []
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def at(self, due, name, priority=0):
+        heapq.heappush(self.queue, (due, priority, next(self.sequence), name))
+
+    def pop(self, now):
+        # Returns the next event due at or before now, or None; events a handler
+        # schedules for now are picked up by the same drain loop
+        if self.queue and self.queue[0][0] <= now:
+            return heapq.heappop(self.queue)[3]
+        return None
+
+    def cancel(self, name):
+        kept = [entry for entry in self.queue if entry[3] != name]
+        if len(kept) != len(self.queue):
+            heapq.heapify(kept)
+            self.queue = kept
@@ -0,0 +1,126 @@
+import bisect
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+LEADERBOARD_SIZE = 10
+# Mode for a score file that does not exist yet; an existing file keeps its own
+NEW_FILE_MODE = 0o644
+
+
+class ScoreStore:
+    def __init__(self, path, capacity=LEADERBOARD_SIZE):
+        self.path = path
+        self.capacity = capacity
+        self.loaded = False
+        self.best = 0
+        self.runs = 0
+        self.entries = []
+        self.sort_keys = []
+        self.writes = queue.Queue()
+        self.writer = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            self.best = int(data.get("highscore", 0))
+            self.runs = int(data.get("runs", 0))
+            for entry in data.get("leaderboard", []):
+                # A hand-edited or truncated entry is dropped rather than failing the whole board
+                if isinstance(entry, dict) and isinstance(entry.get("score"), (int, float)):
+                    self._insert(entry)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+
+    @property
+    def highscore(self):
+        self.load()
+        return self.best
+
+    def leaderboard(self):
+        self.load()
+        return list(self.entries)
+
+    def _insert(self, entry):
+        # Kept sorted best-first; older runs win ties so a new equal score does not displace them
+        sort_key = (-entry["score"], entry.get("timestamp", 0))
+        if len(self.entries) >= self.capacity and sort_key >= self.sort_keys[-1]:
+            return False
+        index = bisect.bisect_right(self.sort_keys, sort_key)
+        self.sort_keys.insert(index, sort_key)
+        self.entries.insert(index, entry)
+        if len(self.entries) > self.capacity:
+            self.sort_keys.pop()
+            self.entries.pop()
+        return True
+
+    def record(self, score, settings, won=False):
+        self.load()
+        entry = {"score": score, "won": won, "timestamp": time.time(), "settings": dict(settings)}
+        with self.lock:
+            self.runs += 1
+            self.best = max(self.best, score)
+            self._insert(entry)
+            snapshot = {"highscore": self.best, "runs": self.runs, "leaderboard": list(self.entries)}
+        self._schedule(snapshot)
+
+    def _schedule(self, snapshot):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+            self.writer.start()
+        self.writes.put(snapshot)
+
+    def _write_loop(self):
+        while True:
+            snapshot = self.writes.get()
+            stop = snapshot is None
+            # Only the newest snapshot matters; skip any that piled up behind it
+            while True:
+                try:
+                    newer = self.writes.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                else:
+                    snapshot = newer
+            if snapshot is not None:
+                self._write(snapshot)
+            if stop:
+                return
+
+    def _write(self, snapshot):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            try:
+                mode = os.stat(self.path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = NEW_FILE_MODE
+            handle, temp_path = tempfile.mkstemp(prefix=".highscore-", suffix=".tmp", dir=directory)
+            # mkstemp creates the file 0600, and os.replace would carry that over
+            os.chmod(temp_path, mode)
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(snapshot, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.path)
+        except OSError:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def close(self):
+        if self.writer is not None:
+            self.writes.put(None)
+            self.writer.join()
+            self.writer = None
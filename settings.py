@@ -0,0 +1,29 @@
+DEFAULT_SETTINGS = {
+    "CAT_SPAWN_INTERVAL": 100,
+    "CATS_BEFORE_BOSS": 40,
+    "DOG_SPEED": 7,
+    "GLOBAL_CAT_SPEED": 2.0,
+    "MAX_CAT_SPEED": 7.5,
+    "BOSS_CAT_SPEED": 5.0,
+    "BOSS_CAT_HEALTH": 20,
+    "BARK_SPEED": 45,
+    "FOOD_LEVELS_BEFORE_DOG": 4,
+    "FOOD_X_OFFSET": -20,
+    "FOOD_X_BASE": 200,
+    "SPEED_INCREASE_INTERVAL": 10000,
+}
+
+SETTING_OPTIONS = [
+    ("Cat spawn interval", "CAT_SPAWN_INTERVAL", 10, 10, 400),
+    ("Cats before boss", "CATS_BEFORE_BOSS", 1, 1, 200),
+    ("Dog speed", "DOG_SPEED", 1, 1, 20),
+    ("Initial cat speed", "GLOBAL_CAT_SPEED", 0.5, 0.5, 10),
+    ("Max cat speed", "MAX_CAT_SPEED", 0.5, 1, 20),
+    ("Boss cat speed", "BOSS_CAT_SPEED", 0.5, 1, 20),
+    ("Boss cat health", "BOSS_CAT_HEALTH", 1, 1, 100),
+    ("Bark speed", "BARK_SPEED", 1, 5, 100),
+    ("Food levels before dog", "FOOD_LEVELS_BEFORE_DOG", 1, 1, 10),
+    ("Food X offset", "FOOD_X_OFFSET", 10, -200, 200),
+    ("Food X base", "FOOD_X_BASE", 10, 0, 640),
+    ("Speed increase interval", "SPEED_INCREASE_INTERVAL", 500, 1000, 60000),
+]
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import namedtuple
+
+import pygame
+from assets import ASSETS
+from characters import LEFT, Cat, CatSwarm, Dog
+from game import MAX_CATCH_UP_TICKS, NO_INPUT, TICK_MS
+from rendering import SpriteBatch
+
+CatFrame = namedtuple("CatFrame", ["x", "y", "previous_x", "previous_y", "facing_left", "enlarged"])
+
+
+class Snapshot(namedtuple("Snapshot", [
+    "sequence", "published", "frame", "time_ms", "dog", "cats", "foods",
+    "cats_destroyed", "game_over", "game_over_time", "won",
+])):
+    __slots__ = ()
+
+    @property
+    def finished(self):
+        return self.won or self.game_over
+
+
+def _frozen(array):
+    array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def take_snapshot(state, sequence):
+    dog = state.dog
+    cats = state.cats
+    count = cats.count
+    cat_frame = CatFrame(
+        _frozen(cats.x[:count]),
+        _frozen(cats.y[:count]),
+        _frozen(cats.previous_x[:count]),
+        _frozen(cats.previous_y[:count]),
+        _frozen(cats.direction[:count] == CatSwarm.LEFT),
+        _frozen(cats.enlarged[:count]),
+    )
+    return Snapshot(
+        sequence,
+        time.perf_counter(),
+        state.frame,
+        state.time_ms,
+        (dog.x, dog.y, dog.previous_x, dog.previous_y, dog.position == LEFT),
+        cat_frame,
+        tuple((food.image, food.x, food.y, food.width, food.height) for food in state.foods),
+        dog.cats_destroyed,
+        state.game_over,
+        state.game_over_time,
+        state.won,
+    )
+
+
+class SimulationThread:
+    # Steps a GameState on its own thread and, after every tick, builds a new
+    # read-only Snapshot (fresh array copies) and publishes it by rebinding
+    # self.front. That rebinding is atomic, and published snapshots are never
+    # modified, so the renderer can keep drawing the one it took without a lock.
+    def __init__(self, state, tick_ms=TICK_MS, max_catch_up=MAX_CATCH_UP_TICKS, controller=None):
+        self.state = state
+        # Replays drive the simulation from a recording instead of the latest inputs
+        self.controller = controller
+        self.tick_seconds = tick_ms / 1000
+        self.max_catch_up = max_catch_up
+        self.inputs = NO_INPUT
+        # Append-only; the renderer remembers how far it has read
+        self.sound_log = []
+        self.sounds_read = 0
+        self.produced = 0
+        self.consumed = 0
+        self.last_consumed = -1
+        self.dropped_ticks = 0
+        self.error = None
+        self.front = take_snapshot(state, 0)
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            state = self.state
+            next_tick = time.perf_counter()
+            while not self.stopping.is_set():
+                now = time.perf_counter()
+                if now < next_tick:
+                    self.stopping.wait(next_tick - now)
+                    continue
+                behind = int((now - next_tick) / self.tick_seconds)
+                if behind > self.max_catch_up:
+                    # Same policy as FixedTimestep: drop the backlog rather than spiral
+                    self.dropped_ticks += behind - self.max_catch_up
+                    next_tick += (behind - self.max_catch_up) * self.tick_seconds
+                state.step(self.inputs if self.controller is None else self.controller(state))
+                if state.sounds:
+                    self.sound_log.extend(state.sounds)
+                self.produced += 1
+                self.front = take_snapshot(state, self.produced)
+                next_tick += self.tick_seconds
+        except Exception as error:
+            self.error = error
+
+    def consume(self):
+        if self.error is not None:
+            raise self.error
+        snapshot = self.front
+        if snapshot.sequence != self.last_consumed:
+            self.last_consumed = snapshot.sequence
+            self.consumed += 1
+        return snapshot
+
+    def alpha(self, snapshot):
+        # How far the renderer is into the tick after this snapshot, for interpolation
+        return min(1.0, (time.perf_counter() - snapshot.published) / self.tick_seconds)
+
+    def new_sounds(self):
+        end = len(self.sound_log)
+        sounds = self.sound_log[self.sounds_read:end]
+        self.sounds_read = end
+        return sounds
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def stats(self):
+        return {
+            "produced": self.produced,
+            "consumed": self.consumed,
+            "skipped": self.produced - self.consumed,
+            "dropped_ticks": self.dropped_ticks,
+        }
+
+
+def draw_snapshot(screen, snapshot, alpha=1.0, batch=None):
+    # Returns the screen rects that were drawn, for the dirty-rect renderer
+    if batch is None:
+        batch = SpriteBatch()
+    food_rects = []
+    for image, x, y, width, height in snapshot.foods:
+        if image:
+            batch.add(image, (x, y))
+        else:
+            food_rects.append(pygame.draw.rect(screen, (100, 255, 100), (x, y, width, height)))
+
+    cats = snapshot.cats
+    if len(cats.x):
+        xs = (cats.previous_x + (cats.x - cats.previous_x) * alpha).tolist()
+        ys = (cats.previous_y + (cats.y - cats.previous_y) * alpha).tolist()
+        variants = Cat.sprite_variants()
+        keys = (cats.facing_left + 2 * cats.enlarged).tolist()
+        batch.extend(zip(map(variants.__getitem__, keys), zip(xs, ys)))
+
+    dog_x, dog_y, previous_x, previous_y, facing_left = snapshot.dog
+    dog_image = ASSETS.image(Dog.IMAGE_PATH, alpha=True, flip_x=facing_left)
+    batch.add(dog_image, (previous_x + (dog_x - previous_x) * alpha, previous_y + (dog_y - previous_y) * alpha))
+    return food_rects + batch.flush(screen, rects=True)
@@ -0,0 +1,48 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.stages = []
+        self.marked = set()
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        # Records the time since the previous mark on the main thread's timeline
+        now = time.perf_counter()
+        with self.lock:
+            self.stages.append((name, now - self.last, now - self.started))
+            self.last = now
+
+    def mark_once(self, name):
+        if name in self.marked:
+            return False
+        self.marked.add(name)
+        self.mark(name)
+        return True
+
+    @contextmanager
+    def stage(self, name):
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            with self.lock:
+                self.stages.append((name, now - began, now - self.started))
+                if threading.current_thread() is threading.main_thread():
+                    self.last = now
+
+    def report(self):
+        lines = ["Startup timings (ms):"]
+        with self.lock:
+            for name, duration, elapsed in self.stages:
+                lines.append(f"  {duration * 1000:8.1f}  {name}  (at {elapsed * 1000:.1f})")
+        return "\n".join(lines)
+
+
+STARTUP = StartupTimer()
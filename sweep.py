@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game import TICK_MS, chase_bot, simulate
+from settings import DEFAULT_SETTINGS, SETTING_OPTIONS
+
+SWEEP_KEYS = ["CAT_SPAWN_INTERVAL", "GLOBAL_CAT_SPEED", "MAX_CAT_SPEED", "BARK_SPEED", "BOSS_CAT_HEALTH"]
+DEFAULT_MAX_FRAMES = 30000
+SETTING_RANGES = {key: (step, min_value, max_value) for _, key, step, min_value, max_value in SETTING_OPTIONS}
+
+
+def parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def grid_configs(grid):
+    keys = sorted(grid)
+    for values in itertools.product(*(grid[key] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def random_configs(keys, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        config = {}
+        for key in keys:
+            step, min_value, max_value = SETTING_RANGES[key]
+            steps = int(round((max_value - min_value) / step))
+            config[key] = min_value + rng.randint(0, steps) * step
+        yield config
+
+
+def config_id(overrides, seeds, max_frames):
+    payload = json.dumps({"settings": overrides, "seeds": seeds, "max_frames": max_frames}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def effective_overrides(overrides):
+    # Same rule the options screen enforces: the speed cap never sits below the starting
+    # speed. Applied before ids and reports so results name the settings that actually ran.
+    settings = dict(DEFAULT_SETTINGS, **overrides)
+    if settings["MAX_CAT_SPEED"] < settings["GLOBAL_CAT_SPEED"]:
+        return dict(overrides, MAX_CAT_SPEED=settings["GLOBAL_CAT_SPEED"])
+    return overrides
+
+
+def run_config(overrides, seeds, max_frames):
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(overrides)
+    runs = []
+    started = time.perf_counter()
+    for seed in seeds:
+        state = simulate(settings, chase_bot, max_frames, seed=seed)
+        runs.append({
+            "seed": seed,
+            "won": state.won,
+            "died": state.game_over,
+            "survival_seconds": state.frame * TICK_MS / 1000,
+            "cats_destroyed": state.dog.cats_destroyed,
+        })
+    return {
+        "settings": overrides,
+        "runs": len(runs),
+        "win_rate": sum(run["won"] for run in runs) / len(runs),
+        "mean_survival_seconds": sum(run["survival_seconds"] for run in runs) / len(runs),
+        "mean_cats_destroyed": sum(run["cats_destroyed"] for run in runs) / len(runs),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "per_run": runs,
+    }
+
+
+def completed_ids(path):
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as handle:
+        text = handle.read()
+    for line in text.splitlines():
+        try:
+            done.add(json.loads(line)["id"])
+        except (ValueError, KeyError):
+            # A line cut short by an interrupted run; that config simply runs again
+            continue
+    if text and not text.endswith("\n"):
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write("\n")
+    return done
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run headless settings sweeps with the scripted bot.")
+    parser.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2,...", help="grid values for one setting (repeatable)")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N random configurations instead of a grid")
+    parser.add_argument("--keys", default=",".join(SWEEP_KEYS), help="settings to sample with --random")
+    parser.add_argument("--runs", type=int, default=5, help="seeded runs per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for runs and random sampling")
+    parser.add_argument("--frames", type=int, default=DEFAULT_MAX_FRAMES, help="frame cap per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="sweep_results.jsonl")
+    options = parser.parse_args(args)
+
+    if options.random:
+        keys = [key for key in options.keys.split(",") if key]
+        unknown = [key for key in keys if key not in SETTING_RANGES]
+        if unknown:
+            parser.error(f"unknown setting: {', '.join(unknown)}")
+        configs = random_configs(keys, options.random, options.seed)
+    elif options.grid:
+        grid = {}
+        for entry in options.grid:
+            key, _, values = entry.partition("=")
+            if key not in DEFAULT_SETTINGS or not values:
+                parser.error(f"bad --grid entry: {entry}")
+            grid[key] = [parse_value(value) for value in values.split(",")]
+        configs = grid_configs(grid)
+    else:
+        parser.error("give at least one --grid KEY=V1,V2 or --random N")
+
+    seeds = [options.seed + index for index in range(options.runs)]
+    done = completed_ids(options.output)
+    pending = {}
+    for overrides in map(effective_overrides, configs):
+        identifier = config_id(overrides, seeds, options.frames)
+        if identifier not in done and identifier not in pending:
+            pending[identifier] = overrides
+    print(f"{len(pending)} configurations to run, {len(done)} already in {options.output}")
+
+    with open(options.output, "a", encoding="utf-8") as results, ProcessPoolExecutor(options.workers) as pool:
+        futures = {pool.submit(run_config, overrides, seeds, options.frames): identifier for identifier, overrides in pending.items()}
+        for finished, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            result["id"] = futures[future]
+            results.write(json.dumps(result) + "\n")
+            results.flush()
+            print(
+                f"[{finished}/{len(futures)}] {result['settings']} win rate {result['win_rate']:.2f}, "
+                f"survival {result['mean_survival_seconds']:.1f}s, cats {result['mean_cats_destroyed']:.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())